@@ -0,0 +1,17 @@
+-- 003_http_validators.sql
+-- Conditional GET validators (ETag / Last-Modified) for feeds and listing pages.
+
+BEGIN;
+
+-- ============================================================
+-- http_validators — last validators seen per polled URL
+-- ============================================================
+CREATE TABLE IF NOT EXISTS http_validators (
+    url             TEXT PRIMARY KEY,
+    source_id       TEXT REFERENCES sources(source_id),
+    etag            TEXT,
+    last_modified   TEXT,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+COMMIT;
@@ -0,0 +1,11 @@
+-- 004_item_content_length.sql
+-- Byte size of downloaded documents, used to skip re-posted PDFs before download.
+
+BEGIN;
+
+ALTER TABLE items ADD COLUMN IF NOT EXISTS content_length BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_items_source_content_length
+    ON items (source_id, content_length) WHERE content_length IS NOT NULL;
+
+COMMIT;
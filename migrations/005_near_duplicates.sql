@@ -0,0 +1,17 @@
+-- 005_near_duplicates.sql
+-- SimHash fingerprints for near-duplicate detection of syndicated articles.
+
+BEGIN;
+
+ALTER TABLE items ADD COLUMN IF NOT EXISTS simhash BIGINT;
+ALTER TABLE items ADD COLUMN IF NOT EXISTS duplicate_of UUID REFERENCES items(id);
+
+-- LSH bands: four 16-bit slices of the 64-bit fingerprint. Two fingerprints
+-- within Hamming distance 3 always share at least one band exactly.
+CREATE INDEX IF NOT EXISTS idx_items_simhash_b0 ON items (((simhash >> 48) & 65535)) WHERE simhash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_items_simhash_b1 ON items (((simhash >> 32) & 65535)) WHERE simhash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_items_simhash_b2 ON items (((simhash >> 16) & 65535)) WHERE simhash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_items_simhash_b3 ON items ((simhash & 65535))         WHERE simhash IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_items_duplicate_of ON items (duplicate_of);
+
+COMMIT;
@@ -0,0 +1,32 @@
+-- 006_serper_cache_collector_stats.sql
+-- Serper result cache and per-day collector counters.
+
+BEGIN;
+
+-- ============================================================
+-- serper_cache — organic results per (query, hl, gl, window)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS serper_cache (
+    cache_key       TEXT PRIMARY KEY,                  -- sha256 of query|hl|gl|window
+    query           TEXT NOT NULL,
+    hl              TEXT NOT NULL,
+    gl              TEXT NOT NULL,
+    time_window     TEXT NOT NULL,                     -- Serper tbs, e.g. "qdr:w"
+    results         JSONB NOT NULL DEFAULT '[]',
+    fetched_at      TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+-- ============================================================
+-- collector_stats — daily counters per source (calls, fetches saved, ...)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS collector_stats (
+    day             DATE NOT NULL DEFAULT CURRENT_DATE,
+    source_id       TEXT NOT NULL,
+    metric          TEXT NOT NULL,
+    value           BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, source_id, metric)
+);
+
+CREATE INDEX IF NOT EXISTS idx_collector_stats_metric ON collector_stats (metric, day);
+
+COMMIT;
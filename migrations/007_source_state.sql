@@ -0,0 +1,22 @@
+-- 007_source_state.sql
+-- Per-source collection state for yield-driven adaptive scheduling.
+
+BEGIN;
+
+-- ============================================================
+-- source_state — operational stats + current interval per source
+-- ============================================================
+CREATE TABLE IF NOT EXISTS source_state (
+    source_id               TEXT PRIMARY KEY REFERENCES sources(source_id),
+    interval_minutes        INT NOT NULL,
+    yield_ewma              REAL NOT NULL DEFAULT 0,    -- smoothed new items per run
+    runs                    INT NOT NULL DEFAULT 0,
+    failures                INT NOT NULL DEFAULT 0,
+    consecutive_failures    INT NOT NULL DEFAULT 0,
+    new_items_total         INT NOT NULL DEFAULT 0,
+    last_run_at             TIMESTAMPTZ,
+    last_success_at         TIMESTAMPTZ,
+    updated_at              TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+COMMIT;
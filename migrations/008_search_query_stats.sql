@@ -0,0 +1,26 @@
+-- 008_search_query_stats.sql
+-- Per-query yield stats for bandit-driven web search query selection.
+
+BEGIN;
+
+-- ============================================================
+-- search_query_stats — pulls and rewards per (source, query)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS search_query_stats (
+    source_id       TEXT NOT NULL,
+    query           TEXT NOT NULL,
+    pulls           INT NOT NULL DEFAULT 0,
+    new_urls        INT NOT NULL DEFAULT 0,            -- unseen URLs the query surfaced
+    event_items     INT NOT NULL DEFAULT 0,            -- of those, items that produced events
+    last_used_at    TIMESTAMPTZ,
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (source_id, query)
+);
+
+-- Which query surfaced a web_search item (for event attribution)
+ALTER TABLE items ADD COLUMN IF NOT EXISTS search_query TEXT;
+
+CREATE INDEX IF NOT EXISTS idx_items_search_query ON items (source_id, search_query)
+    WHERE search_query IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,18 @@
+-- 009_link_template_stats.sql
+-- Fetch outcomes per (source, URL template) for learned scrape_html link ranking.
+
+BEGIN;
+
+-- ============================================================
+-- link_template_stats — how often a link shape was fetched / came back empty
+-- ============================================================
+CREATE TABLE IF NOT EXISTS link_template_stats (
+    source_id       TEXT NOT NULL REFERENCES sources(source_id),
+    template        TEXT NOT NULL,                     -- e.g. "/news/{yyyy}/{n2}/{slug}"
+    fetches         INT NOT NULL DEFAULT 0,
+    empty_fetches   INT NOT NULL DEFAULT 0,            -- fetched but produced no item
+    updated_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (source_id, template)
+);
+
+COMMIT;
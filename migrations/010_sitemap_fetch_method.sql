@@ -0,0 +1,21 @@
+-- 010_sitemap_fetch_method.sql
+-- 'sitemap' fetch method + per-source lastmod watermark.
+
+BEGIN;
+
+-- ============================================================
+-- sources.fetch_method — allow 'sitemap'
+-- ============================================================
+ALTER TABLE sources DROP CONSTRAINT IF EXISTS sources_fetch_method_check;
+ALTER TABLE sources ADD CONSTRAINT sources_fetch_method_check
+    CHECK (fetch_method IN (
+        'rss', 'scrape_html', 'scrape_js',
+        'api', 'pdf_monitor', 'web_search', 'sitemap'
+    ));
+
+-- ============================================================
+-- source_state.sitemap_watermark — newest lastmod already processed
+-- ============================================================
+ALTER TABLE source_state ADD COLUMN IF NOT EXISTS sitemap_watermark TIMESTAMPTZ;
+
+COMMIT;
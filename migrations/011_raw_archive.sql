@@ -0,0 +1,14 @@
+-- 011_raw_archive.sql
+-- Pointer from items to the content-addressed raw body archive.
+
+BEGIN;
+
+-- ============================================================
+-- items.raw_sha256 / raw_format — archived body (see src/collector/archive.py)
+-- ============================================================
+ALTER TABLE items ADD COLUMN IF NOT EXISTS raw_sha256 TEXT;     -- SHA-256 of the uncompressed body
+ALTER TABLE items ADD COLUMN IF NOT EXISTS raw_format TEXT;     -- 'html' | 'pdf'
+
+CREATE INDEX IF NOT EXISTS idx_items_raw_sha256 ON items (raw_sha256) WHERE raw_sha256 IS NOT NULL;
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- 012_scrape_hybrid_fetch_method.sql
+-- Static-first fetch method that falls back to Playwright per domain.
+
+BEGIN;
+
+-- ============================================================
+-- sources.fetch_method — allow 'scrape_hybrid'
+-- ============================================================
+ALTER TABLE sources DROP CONSTRAINT IF EXISTS sources_fetch_method_check;
+ALTER TABLE sources ADD CONSTRAINT sources_fetch_method_check
+    CHECK (fetch_method IN (
+        'rss', 'scrape_html', 'scrape_js', 'scrape_hybrid',
+        'api', 'pdf_monitor', 'web_search', 'sitemap'
+    ));
+
+COMMIT;
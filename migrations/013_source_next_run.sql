@@ -0,0 +1,11 @@
+-- 013_source_next_run.sql
+-- Persisted next fire time per source so restarts resume the schedule.
+
+BEGIN;
+
+-- ============================================================
+-- source_state.next_run_at — next scheduled collection
+-- ============================================================
+ALTER TABLE source_state ADD COLUMN IF NOT EXISTS next_run_at TIMESTAMPTZ;
+
+COMMIT;
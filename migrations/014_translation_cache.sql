@@ -0,0 +1,22 @@
+-- 014_translation_cache.sql
+-- Paragraph-level translation memo, shared across items and re-runs.
+
+BEGIN;
+
+-- ============================================================
+-- translation_cache — one row per (language, normalized paragraph, model)
+-- ============================================================
+CREATE TABLE IF NOT EXISTS translation_cache (
+    source_lang     TEXT NOT NULL,
+    text_hash       TEXT NOT NULL,                     -- SHA-256 of the normalized paragraph
+    model           TEXT NOT NULL,
+    translation     TEXT NOT NULL,
+    hits            INT NOT NULL DEFAULT 0,
+    created_at      TIMESTAMPTZ NOT NULL DEFAULT now(),
+    last_used_at    TIMESTAMPTZ NOT NULL DEFAULT now(),
+    PRIMARY KEY (source_lang, text_hash, model)
+);
+
+CREATE INDEX IF NOT EXISTS idx_translation_cache_last_used ON translation_cache (last_used_at);
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- 015_translation_meta.sql
+-- Per-chunk translation confidence.
+
+BEGIN;
+
+-- ============================================================
+-- translation_cache.confidence — confidence of the chunk a unit came from
+-- ============================================================
+ALTER TABLE translation_cache ADD COLUMN IF NOT EXISTS confidence REAL;
+
+-- ============================================================
+-- items.translation_meta — chunk breakdown behind translation_confidence
+-- ============================================================
+ALTER TABLE items ADD COLUMN IF NOT EXISTS translation_meta JSONB;
+
+COMMIT;
@@ -0,0 +1,15 @@
+-- 016_source_relevant_items.sql
+-- Relevant-item counter over the same window as source_state.new_items_total.
+
+BEGIN;
+
+-- ============================================================
+-- source_state.relevant_items_total — collected items that produced events
+-- ============================================================
+ALTER TABLE source_state ADD COLUMN IF NOT EXISTS relevant_items_total INT NOT NULL DEFAULT 0;
+
+-- sources.relevant_article_count is all-time; restart new_items_total so both
+-- counters of the relevance ratio cover the same window from here on
+UPDATE source_state SET new_items_total = 0;
+
+COMMIT;
@@ -0,0 +1,16 @@
+-- 017_item_relevant_counted.sql
+-- Count an item towards its source's relevance only once, however often it is reprocessed.
+
+BEGIN;
+
+-- ============================================================
+-- items.relevant_counted_at — when the item first produced events
+-- ============================================================
+ALTER TABLE items ADD COLUMN IF NOT EXISTS relevant_counted_at TIMESTAMPTZ;
+
+-- Items that already have events were counted when they were extracted
+UPDATE items i SET relevant_counted_at = now()
+WHERE i.relevant_counted_at IS NULL
+  AND EXISTS (SELECT 1 FROM events e WHERE e.item_id = i.id);
+
+COMMIT;
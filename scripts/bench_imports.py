@@ -0,0 +1,106 @@
+"""Benchmark import (startup) time per entry point.
+
+Each entry point is imported in a fresh interpreter several times; the median
+wall time is reported together with the heaviest modules from `python -X
+importtime`. The "first language detection" row shows where the lingua model
+cost now lands.
+
+    python scripts/bench_imports.py [--repeat 5] [--top 5]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _script(name: str) -> str:
+    # Execute a script's module body (imports + top-level setup) without running main()
+    return (
+        "import importlib.util; "
+        f"spec = importlib.util.spec_from_file_location('bench_target', r'{ROOT / 'scripts' / name}'); "
+        "module = importlib.util.module_from_spec(spec); spec.loader.exec_module(module)"
+    )
+
+
+ENTRY_POINTS = {
+    "pipeline (scripts/run_pipeline.py)": _script("run_pipeline.py"),
+    "api (src.api.app)": "import src.api.app",
+    "backfill (scripts/backfill.py)": _script("backfill.py"),
+    "seed_db (scripts/seed_db.py)": _script("seed_db.py"),
+    "reextract (scripts/reextract_archive.py)": _script("reextract_archive.py"),
+    "collector scheduler": "import src.collector.scheduler",
+    "first language detection": (
+        "from src.normalizer.lang_detect import detect_language; "
+        "detect_language('Samsung expands HBM capacity this quarter')"
+    ),
+}
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    # Settings needs these to instantiate; nothing connects during an import benchmark
+    env.setdefault("DATABASE_URL", "postgresql://bench@localhost/bench")
+    env.setdefault("OPENROUTER_API_KEY", "bench")
+    env["PYTHONPATH"] = str(ROOT) + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def _run(code: str, env: dict) -> tuple[float, str]:
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - started
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr else "failed")
+    return elapsed, proc.stderr
+
+
+def _heaviest(importtime: str, top: int) -> list[tuple[str, float]]:
+    """Top-level packages by cumulative import time (ms)."""
+    totals: dict[str, float] = {}
+    for line in importtime.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = [p.strip() for p in line[len("import time:"):].split("|")]
+        if len(parts) != 3 or not parts[1].isdigit():
+            continue
+        name = parts[2]
+        if name.startswith(" ") or name != name.lstrip():
+            continue
+        package = name.split(".")[0]
+        totals[package] = max(totals.get(package, 0.0), int(parts[1]) / 1000)
+    return sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark import time per entry point")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest packages to list")
+    args = parser.parse_args()
+
+    env = _env()
+    baseline = statistics.median(_run("pass", env)[0] for _ in range(args.repeat))
+    print(f"{'entry point':<42} {'median':>9} {'net':>9}   heaviest imports (cumulative ms)")
+    print(f"{'bare interpreter':<42} {baseline * 1000:>7.0f}ms {'':>9}")
+    for label, code in ENTRY_POINTS.items():
+        try:
+            runs = [_run(code, env) for _ in range(args.repeat)]
+        except RuntimeError as exc:
+            print(f"{label:<42} {'error':>9}   {exc}")
+            continue
+        median = statistics.median(t for t, _ in runs)
+        heavy = ", ".join(f"{name} {ms:.0f}" for name, ms in _heaviest(runs[-1][1], args.top))
+        print(f"{label:<42} {median * 1000:>7.0f}ms {(median - baseline) * 1000:>7.0f}ms   {heavy}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Re-run text extraction over archived raw bodies, offline, and requeue changed items.
+
+Use after changing trafilatura settings or the PDF extractor: items whose text
+changes are reset to COLLECTED (translation, events and mentions cleared) so the
+pipeline reprocesses them. SKIPPED items keep their status and text.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+sys.path.insert(0, str(__import__("pathlib").Path(__file__).resolve().parent.parent))
+
+from src import db
+from src.collector.archive import archive_root, reextract_blob
+from src.collector.dedup import content_hash
+from src.collector.near_dup import simhash
+from src.settings import settings
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
+
+_BATCH = 200
+
+
+async def reextract(
+    source_id: str | None,
+    raw_format: str | None,
+    since: datetime | None,
+    limit: int | None,
+    workers: int,
+    dry_run: bool,
+) -> None:
+    conditions = ["raw_sha256 IS NOT NULL"]
+    params: list = []
+    for column, value, op in (("source_id", source_id, "="), ("raw_format", raw_format, "="),
+                              ("fetched_at", since, ">=")):
+        if value is not None:
+            params.append(value)
+            conditions.append(f"{column} {op} ${len(params)}")
+    query = (
+        "SELECT id, raw_sha256, raw_format, content_hash FROM items WHERE "
+        + " AND ".join(conditions) + " ORDER BY fetched_at"
+    )
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    rows = await db.fetch(query, *params)
+    logger.info("Re-extracting %d archived items with %d workers", len(rows), workers)
+
+    loop = asyncio.get_running_loop()
+    root = str(archive_root())
+    changed = requeued = missing = 0
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        for start in range(0, len(rows), _BATCH):
+            batch = rows[start:start + _BATCH]
+            results = await asyncio.gather(
+                *[
+                    loop.run_in_executor(
+                        pool, reextract_blob, root, r["raw_sha256"], r["raw_format"],
+                        settings.parse_single_pass, settings.pdf_max_pages, settings.pdf_max_chars,
+                        settings.pdf_pages_per_task,
+                    )
+                    for r in batch
+                ],
+                return_exceptions=True,
+            )
+            updates = []
+            for row, result in zip(batch, results):
+                if isinstance(result, FileNotFoundError):
+                    missing += 1
+                    continue
+                if isinstance(result, BaseException):
+                    logger.warning("Item %s: re-extraction failed: %s", row["id"], result)
+                    continue
+                text, title = result
+                if text and content_hash(text) != row["content_hash"]:
+                    updates.append((row["id"], text, title or None, content_hash(text), simhash(text)))
+            changed += len(updates)
+            if updates and not dry_run:
+                requeued += await _requeue(updates)
+            logger.info("Processed %d/%d (%d changed)", start + len(batch), len(rows), changed)
+
+    if dry_run:
+        logger.info("Done: %d changed (dry run, nothing written), %d blobs missing", changed, missing)
+    else:
+        logger.info(
+            "Done: %d changed, %d requeued (SKIPPED items left as is), %d blobs missing",
+            changed, requeued, missing,
+        )
+
+
+async def _requeue(updates: list[tuple]) -> int:
+    """Store the new text and reset the items to COLLECTED; returns how many were reset.
+
+    SKIPPED items (near-duplicates, low-relevance) are left alone. The events and
+    entity mentions of reset items are dropped so reprocessing does not duplicate them.
+    """
+    ids, texts, titles, hashes, simhashes = (list(col) for col in zip(*updates))
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            reset = await conn.fetch(
+                """UPDATE items i
+                   SET raw_text = u.raw_text,
+                       title = COALESCE(u.title, i.title),
+                       content_hash = u.content_hash,
+                       simhash = u.simhash,
+                       text_en = NULL,
+                       translation_confidence = NULL,
+                       pipeline_status = 'COLLECTED',
+                       pipeline_error = NULL,
+                       updated_at = now()
+                   FROM unnest($1::uuid[], $2::text[], $3::text[], $4::text[], $5::bigint[])
+                        AS u(id, raw_text, title, content_hash, simhash)
+                   WHERE i.id = u.id AND i.pipeline_status <> 'SKIPPED'
+                   RETURNING i.id""",
+                ids, texts, titles, hashes, simhashes,
+            )
+            reset_ids = [r["id"] for r in reset]
+            if reset_ids:
+                await conn.execute(
+                    "DELETE FROM entity_mentions WHERE item_id = ANY($1::uuid[])", reset_ids
+                )
+                await conn.execute(
+                    """DELETE FROM theme_events WHERE event_id IN
+                       (SELECT id FROM events WHERE item_id = ANY($1::uuid[]))""",
+                    reset_ids,
+                )
+                await conn.execute("DELETE FROM events WHERE item_id = ANY($1::uuid[])", reset_ids)
+    return len(reset_ids)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Re-extract item text from the raw archive")
+    parser.add_argument("--source", default=None, help="Filter by source_id")
+    parser.add_argument("--format", choices=["html", "pdf"], default=None, help="Filter by raw format")
+    parser.add_argument("--since", default=None, help="Only items fetched on/after this ISO date")
+    parser.add_argument("--limit", type=int, default=None, help="Max items to process")
+    parser.add_argument("--workers", type=int, default=max(1, (multiprocessing.cpu_count() or 2) - 1))
+    parser.add_argument("--dry-run", action="store_true", help="Report changes without writing")
+    args = parser.parse_args()
+
+    since = None
+    if args.since:
+        since = datetime.fromisoformat(args.since)
+        since = since if since.tzinfo else since.replace(tzinfo=timezone.utc)
+
+    await db.run_migrations()
+    await reextract(args.source, args.format, since, args.limit, args.workers, args.dry_run)
+    await db.close_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
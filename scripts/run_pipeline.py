@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 import signal
 import sys
@@ -10,17 +11,23 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from src import db
+from src.collector.http_client import close_clients
+from src.collector.js_renderer import close_renderer
+from src.collector.url_filter import load_url_filter, log_url_filter_stats
+from src.collector.parsing import shutdown_parsers
 from src.collector.scheduler import build_scheduler, load_source_jobs, run_all_sources_once
+from src.collector import stats as collector_stats
 from src.extractor.event_extractor import extract_and_store
-from src.normalizer.lang_detect import detect_language
-from src.normalizer.translator import translate_to_english
+from src.normalizer.lang_detect import detect_languages, detector_stats, warm_up as warm_up_lang_detect
+from src.normalizer.relevance import score_relevance
+from src.normalizer.translator import translate_document
 from src.linker.entity_linker import link_entities_in_text, store_entity_mentions, load_alias_index
 from src.linker.entity_discovery import promote_entities
 from src.themes.clusterer import run_theme_cycle
 from src.alerts.triage import run_alert_triage
 from src.alerts.digest import build_daily_digest
 from src.collector.query_generator import init as init_query_generator
-from src.settings import PROJECT_ROOT
+from src.settings import PROJECT_ROOT, settings
 
 # ---------------------------------------------------------------------------
 # Logging: console (INFO) + file (DEBUG) — always flushed, never a black box
@@ -63,16 +70,35 @@ PIPELINE_INTERVAL = 15  # seconds between pipeline sweeps
 # Pipeline stages — each logs clearly what it's doing
 # ---------------------------------------------------------------------------
 
-async def _normalize_one(row: dict) -> tuple[bool, str]:
-    """Normalize a single item (detect lang + translate). Returns (ok, title)."""
+async def _normalize_one(row: dict, detected_lang: str) -> tuple[bool, str]:
+    """Normalize a single item (relevance + translate). Returns (ok, title)."""
     title = (row["title"] or "untitled")[:60]
     try:
         text = row["raw_text"] or ""
-        detected_lang, lang_conf = detect_language(text)
 
+        # Native-language relevance prefilter — irrelevant items never reach the LLM
+        prefilter = (
+            settings.relevance_prefilter_enabled
+            and row["tier"] not in settings.relevance_exempt_tiers
+        )
+        if prefilter:
+            score, matched = await score_relevance(f"{row['title'] or ''}\n{text}", detected_lang)
+            if score < settings.relevance_min_score:
+                logger.debug("  skipped (relevance %d %s): %s", score, matched, title)
+                await db.execute(
+                    """UPDATE items SET language = $2, pipeline_status = 'SKIPPED',
+                              pipeline_error = $3, updated_at = now()
+                       WHERE id = $1""",
+                    row["id"], detected_lang, f"low_relevance:{score}",
+                )
+                return True, title
+
+        trans_meta = None
         if detected_lang != "en" and text:
             logger.info("  translating (%s→en): %s", detected_lang, title)
-            text_en, trans_conf = await translate_to_english(text, detected_lang)
+            translation = await translate_document(text, detected_lang)
+            text_en, trans_conf = translation.text, translation.confidence
+            trans_meta = json.dumps(translation.meta)
         else:
             text_en = text
             trans_conf = 1.0
@@ -80,9 +106,10 @@ async def _normalize_one(row: dict) -> tuple[bool, str]:
 
         await db.execute(
             """UPDATE items SET language = $2, text_en = $3,
-                      translation_confidence = $4, updated_at = now()
+                      translation_confidence = $4, translation_meta = $5::jsonb,
+                      updated_at = now()
                WHERE id = $1""",
-            row["id"], detected_lang, text_en, trans_conf,
+            row["id"], detected_lang, text_en, trans_conf, trans_meta,
         )
         return True, title
     except Exception:
@@ -94,6 +121,26 @@ async def _normalize_one(row: dict) -> tuple[bool, str]:
         return False, title
 
 
+_lang_detect_stats_published = False
+
+
+async def publish_lang_detect_stats() -> None:
+    """Write the language detector's build time and memory to collector_stats.
+
+    Runs once, as soon as the memory figure is measured; the values then show up
+    in /api/sources/collector-stats as lang_detect_rss_mb / lang_detect_build_ms.
+    """
+    global _lang_detect_stats_published
+    stats = detector_stats()
+    if _lang_detect_stats_published or "rss_delta_mb" not in stats:
+        return
+    await collector_stats.set_gauges("lang_detect", {
+        "lang_detect_rss_mb": round(stats["rss_delta_mb"]),
+        "lang_detect_build_ms": round(stats["build_seconds"] * 1000),
+    })
+    _lang_detect_stats_published = True
+
+
 async def process_collected_items() -> int:
     """COLLECTED -> detect lang, translate -> NORMALIZED."""
     rows = await db.fetch(
@@ -106,7 +153,8 @@ async def process_collected_items() -> int:
                LIMIT $1
                FOR UPDATE SKIP LOCKED
            )
-           RETURNING id, raw_text, language, title""",
+           RETURNING id, raw_text, language, title,
+                     (SELECT tier FROM sources s WHERE s.source_id = items.source_id) AS tier""",
         BATCH_SIZE,
     )
     if not rows:
@@ -119,7 +167,14 @@ async def process_collected_items() -> int:
         len(rows),
     )
 
-    results = await asyncio.gather(*[_normalize_one(dict(r)) for r in rows])
+    # One batched detection for the whole batch, off the event loop
+    langs = await detect_languages(
+        [r["raw_text"] or "" for r in rows], [r["language"] for r in rows]
+    )
+    await publish_lang_detect_stats()
+    results = await asyncio.gather(
+        *[_normalize_one(dict(r), lang) for r, (lang, _) in zip(rows, langs)]
+    )
     errored = sum(1 for ok, _ in results if not ok)
 
     await db.execute(
@@ -280,6 +335,19 @@ async def pipeline_loop():
         await asyncio.sleep(PIPELINE_INTERVAL)
 
 
+async def initial_sweep():
+    """Collect every source not collected within its interval, then report what we got."""
+    try:
+        new_items = await run_all_sources_once(stale_only=True)
+        logger.info("Initial sweep done: %d new items collected", new_items)
+
+        # Print what we got
+        items_total = await db.fetchval("SELECT COUNT(*) FROM items")
+        logger.info("Total items in DB: %d", items_total)
+    except Exception:
+        logger.exception("Initial sweep error")
+
+
 async def main():
     logger.info("=" * 60)
     logger.info("AI Constraints Radar — starting up")
@@ -295,28 +363,34 @@ async def main():
     logger.info("Loading entity alias index...")
     await load_alias_index()
 
+    # Load the in-memory URL dedup filter
+    logger.info("Loading URL dedup filter...")
+    await load_url_filter()
+
+    # Language models load lazily unless preloading is configured
+    if settings.lang_detect_preload:
+        logger.info("Preloading language detector...")
+        await warm_up_lang_detect()
+        await publish_lang_detect_stats()
+
     # Initialize taxonomy-driven query generator
     logger.info("Initializing query generator...")
-    init_query_generator()
+    await init_query_generator()
 
     # Print DB stats
     src_count = await db.fetchval("SELECT COUNT(*) FROM sources WHERE status = 'CONFIRMED'")
     ent_count = await db.fetchval("SELECT COUNT(*) FROM entities")
     logger.info("DB: %d confirmed sources, %d entities", src_count, ent_count)
 
-    # Initial collection sweep
-    logger.info("─── Initial collection sweep ───")
-    new_items = await run_all_sources_once()
-    logger.info("Initial sweep done: %d new items collected", new_items)
-
-    # Print what we got
-    items_total = await db.fetchval("SELECT COUNT(*) FROM items")
-    logger.info("Total items in DB: %d", items_total)
-
-    # Build and start scheduler
+    # Build the scheduler; jobs resume from their persisted next run times
     scheduler = build_scheduler()
     await load_source_jobs(scheduler)
 
+    # Initial collection sweep of stale sources — runs in the background so the
+    # pipeline loop starts consuming COLLECTED items as soon as the first sources land
+    logger.info("─── Initial collection sweep (background) ───")
+    sweep_task = asyncio.create_task(initial_sweep())
+
     # Daily digest at 07:00 UTC
     scheduler.add_job(
         build_daily_digest,
@@ -328,6 +402,16 @@ async def main():
         replace_existing=True,
     )
 
+    # Hourly URL filter stats
+    scheduler.add_job(
+        log_url_filter_stats,
+        "interval",
+        hours=1,
+        id="url_filter_stats",
+        name="URL Filter Stats",
+        replace_existing=True,
+    )
+
     scheduler.start()
     logger.info("Scheduler started (%d jobs)", len(scheduler.get_jobs()))
 
@@ -351,6 +435,10 @@ async def main():
     # Cleanup
     scheduler.shutdown(wait=False)
     pipeline_task.cancel()
+    sweep_task.cancel()
+    await close_renderer()
+    await close_clients()
+    shutdown_parsers()
     await db.close_pool()
     logger.info("Shutdown complete")
 
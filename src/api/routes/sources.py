@@ -66,3 +66,28 @@ async def source_stats():
         "total_items": items_total,
         "items_by_pipeline_status": {r["pipeline_status"]: r["count"] for r in items_by_status},
     }
+
+
+@router.get("/sources/collector-stats")
+async def collector_stats(
+    days: int = Query(default=7, ge=1, le=90),
+    metric: str | None = Query(default=None),
+):
+    """Daily collector counters summed across sources (e.g. Serper calls / fetches saved).
+
+    Also carries point-in-time gauges such as the language detector's memory use.
+    """
+    rows = await db.fetch(
+        """SELECT day, metric, SUM(value) AS value
+           FROM collector_stats
+           WHERE day > CURRENT_DATE - $1::int
+             AND ($2::text IS NULL OR metric = $2)
+           GROUP BY day, metric
+           ORDER BY day DESC, metric""",
+        days, metric,
+    )
+
+    by_day: dict[str, dict[str, int]] = {}
+    for r in rows:
+        by_day.setdefault(r["day"].isoformat(), {})[r["metric"]] = r["value"]
+    return {"days": by_day}
@@ -0,0 +1,124 @@
+"""Yield-driven adaptive collection intervals.
+
+After every run a source's interval is recomputed from its track record:
+
+- failure: base interval doubled per consecutive failure (exponential backoff)
+- success: smoothed new-items-per-run (EWMA) weighted by relevance — the share
+  of its new items that produced events (source_state.relevant_items_total /
+  new_items_total, both counted over the same window). Productive
+  sources tighten towards schedule_min_minutes, a run with nothing new stretches
+  the current interval by schedule_idle_growth towards schedule_max_minutes.
+
+The scheduler applies the result with jitter (schedule_jitter_fraction) and
+persists each job's next run time (source_state.next_run_at), so a restart
+resumes the existing schedule instead of re-collecting every source.
+"""
+from __future__ import annotations
+
+import math
+from datetime import datetime, timedelta
+
+from src import db
+from src.settings import settings
+
+_EWMA_ALPHA = 0.3
+
+
+def _clamp(minutes: float) -> int:
+    return int(min(settings.schedule_max_minutes, max(settings.schedule_min_minutes, minutes)))
+
+
+def compute_interval(
+    base: int,
+    current: int,
+    yield_ewma: float,
+    relevance: float,
+    new_items: int,
+    consecutive_failures: int,
+) -> int:
+    """Next interval in minutes for a source (see module docstring)."""
+    if consecutive_failures:
+        return _clamp(base * 2 ** min(consecutive_failures, 10))
+    if new_items == 0:
+        return _clamp(current * settings.schedule_idle_growth)
+    productivity = yield_ewma * (1 + 4 * relevance)
+    return _clamp(base / math.sqrt(1 + productivity))
+
+
+async def load_schedule_state() -> dict[str, dict]:
+    """source_id -> persisted interval_minutes / last_success_at / next_run_at."""
+    rows = await db.fetch(
+        "SELECT source_id, interval_minutes, last_success_at, next_run_at FROM source_state"
+    )
+    return {r["source_id"]: dict(r) for r in rows}
+
+
+def is_stale(source: dict, state: dict | None, now: datetime) -> bool:
+    """True when the source's last successful run is older than its interval (or never ran)."""
+    if not state or not state["last_success_at"]:
+        return True
+    minutes = state["interval_minutes"] or source.get("schedule_minutes") or 60
+    return state["last_success_at"] + timedelta(minutes=minutes) <= now
+
+
+def resume_schedule(source: dict, state: dict | None, now: datetime) -> tuple[int, datetime]:
+    """(interval minutes, first run time) for a source's job after a (re)start.
+
+    Stale sources are collected by the startup sweep, so their job starts one
+    interval from now; fresh ones resume at their persisted next run.
+    """
+    minutes = (state and state["interval_minutes"]) or source.get("schedule_minutes") or 60
+    if is_stale(source, state, now):
+        return minutes, now + timedelta(minutes=minutes)
+    next_run = state["next_run_at"]
+    if next_run is None or next_run <= now:
+        next_run = state["last_success_at"] + timedelta(minutes=minutes)
+    return minutes, next_run
+
+
+async def save_next_run(source_id: str, next_run_at: datetime) -> None:
+    await db.execute(
+        "UPDATE source_state SET next_run_at = $2, updated_at = now() WHERE source_id = $1",
+        source_id, next_run_at,
+    )
+
+
+async def record_run(source: dict, new_items: int, failed: bool) -> int:
+    """Update a source's yield stats after a run. Returns its new interval in minutes."""
+    source_id = source["source_id"]
+    base = source.get("schedule_minutes") or 60
+    row = await db.fetchrow(
+        """SELECT interval_minutes, yield_ewma, consecutive_failures,
+                  new_items_total, relevant_items_total
+           FROM source_state WHERE source_id = $1""",
+        source_id,
+    )
+    current = (row and row["interval_minutes"]) or base
+    yield_ewma = (row and row["yield_ewma"]) or 0.0
+    new_total = ((row and row["new_items_total"]) or 0) + new_items
+    relevant = (row and row["relevant_items_total"]) or 0
+    consecutive = ((row and row["consecutive_failures"]) or 0) + 1 if failed else 0
+
+    if not failed:
+        yield_ewma = _EWMA_ALPHA * new_items + (1 - _EWMA_ALPHA) * yield_ewma
+    relevance = min(1.0, relevant / new_total) if new_total else 0.0
+    interval = compute_interval(base, current, yield_ewma, relevance, new_items, consecutive)
+
+    await db.execute(
+        """INSERT INTO source_state (source_id, interval_minutes, yield_ewma, runs, failures,
+                                     consecutive_failures, new_items_total,
+                                     last_run_at, last_success_at)
+           VALUES ($1, $2, $3, 1, $4, $5, $6, now(), CASE WHEN $7 THEN NULL ELSE now() END)
+           ON CONFLICT (source_id) DO UPDATE
+           SET interval_minutes = EXCLUDED.interval_minutes,
+               yield_ewma = EXCLUDED.yield_ewma,
+               runs = source_state.runs + 1,
+               failures = source_state.failures + EXCLUDED.failures,
+               consecutive_failures = EXCLUDED.consecutive_failures,
+               new_items_total = EXCLUDED.new_items_total,
+               last_run_at = now(),
+               last_success_at = COALESCE(EXCLUDED.last_success_at, source_state.last_success_at),
+               updated_at = now()""",
+        source_id, interval, yield_ewma, int(failed), consecutive, new_total, failed,
+    )
+    return interval
@@ -0,0 +1,153 @@
+"""Content-addressed archive of raw fetched bodies (HTML, PDF).
+
+Every body an item was extracted from is stored once, zstd-compressed, at
+settings.archive_dir/<sha[:2]>/<sha[2:4]>/<sha>.zst, keyed by the SHA-256 of the
+uncompressed bytes. items.raw_sha256 / items.raw_format point into the store, so
+scripts/reextract_archive.py can re-run extraction offline after an extractor
+change instead of re-crawling pages that may since have changed or vanished.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from src.settings import PROJECT_ROOT, settings
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 1 << 20
+
+
+def archive_root() -> Path:
+    root = Path(settings.archive_dir)
+    return root if root.is_absolute() else PROJECT_ROOT / root
+
+
+def blob_path(root: Path, sha: str) -> Path:
+    return root / sha[:2] / sha[2:4] / f"{sha}.zst"
+
+
+def _publish(tmp: Path, final: Path) -> None:
+    """Atomically move a finished blob into place (first writer wins)."""
+    if final.exists():
+        tmp.unlink(missing_ok=True)
+        return
+    os.replace(tmp, final)
+
+
+def _write_bytes(root: Path, data: bytes, level: int) -> str:
+    import zstandard
+
+    sha = hashlib.sha256(data).hexdigest()
+    final = blob_path(root, sha)
+    if final.exists():
+        return sha
+    final.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=final.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(zstandard.ZstdCompressor(level=level).compress(data))
+        _publish(Path(tmp), final)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return sha
+
+
+def _write_file(root: Path, path: Path, level: int) -> str:
+    """Hash and compress a file in one streaming pass (large PDFs never sit in memory)."""
+    import zstandard
+
+    digest = hashlib.sha256()
+    root.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=root, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as out, open(path, "rb") as src:
+            with zstandard.ZstdCompressor(level=level).stream_writer(out, closefd=False) as writer:
+                while chunk := src.read(_CHUNK):
+                    digest.update(chunk)
+                    writer.write(chunk)
+        sha = digest.hexdigest()
+        final = blob_path(root, sha)
+        final.parent.mkdir(parents=True, exist_ok=True)
+        _publish(Path(tmp), final)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return sha
+
+
+def read_blob(sha: str, root: Path | None = None) -> bytes:
+    """Decompressed bytes of an archived body. Raises FileNotFoundError if absent."""
+    import zstandard
+
+    with open(blob_path(root or archive_root(), sha), "rb") as f:
+        return zstandard.ZstdDecompressor().stream_reader(f).read()
+
+
+async def archive_bytes(data: bytes) -> str | None:
+    """Store a response body; returns its SHA-256, or None when disabled/failed."""
+    if not settings.archive_enabled or not data:
+        return None
+    try:
+        return await asyncio.to_thread(_write_bytes, archive_root(), data, settings.archive_zstd_level)
+    except Exception as exc:
+        logger.warning("Could not archive body: %s", exc)
+        return None
+
+
+async def archive_file(path: Path) -> str | None:
+    """Store a downloaded file; returns its SHA-256, or None when disabled/failed."""
+    if not settings.archive_enabled:
+        return None
+    try:
+        return await asyncio.to_thread(_write_file, archive_root(), path, settings.archive_zstd_level)
+    except Exception as exc:
+        logger.warning("Could not archive %s: %s", path, exc)
+        return None
+
+
+# ── Worker-side re-extraction (module level so it pickles) ───────────────
+
+def _decompress_to_file(root: Path, sha: str, suffix: str) -> Path:
+    """Stream an archived body into a temp file; the caller must unlink it."""
+    import zstandard
+
+    fd, name = tempfile.mkstemp(suffix=suffix)
+    path = Path(name)
+    try:
+        with open(blob_path(root, sha), "rb") as src, os.fdopen(fd, "wb") as out:
+            zstandard.ZstdDecompressor().copy_stream(src, out, read_size=_CHUNK, write_size=_CHUNK)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+def reextract_blob(
+    root: str,
+    sha: str,
+    raw_format: str,
+    single_pass: bool,
+    max_pages: int,
+    max_chars: int,
+    pages_per_task: int,
+) -> tuple[str, str]:
+    """Re-run text extraction over an archived body. Returns (text, title)."""
+    if raw_format == "pdf":
+        from src.collector.pdf_monitor import pdf_text
+
+        path = _decompress_to_file(Path(root), sha, ".pdf")
+        try:
+            return pdf_text(str(path), max_pages, max_chars, pages_per_task), ""
+        finally:
+            path.unlink(missing_ok=True)
+
+    from src.collector.parsing import _extract_article
+
+    # trafilatura sniffs the charset of raw bytes itself
+    return _extract_article(read_blob(sha, Path(root)), single_pass)
@@ -3,6 +3,9 @@ from __future__ import annotations
 import hashlib
 from urllib.parse import urlparse, urlunparse, parse_qs, urlencode
 
+from src import db
+from src.collector.url_filter import get_url_filter
+
 
 def canonicalize_url(url: str) -> str:
     """Normalize a URL for dedup: lowercase host, strip fragments, sort params, drop tracking."""
@@ -38,3 +41,41 @@ def content_hash(text: str) -> str:
     # Collapse whitespace for stable hashing
     normalized = " ".join(text.split())
     return hashlib.sha256(normalized.encode()).hexdigest()
+
+
+async def filter_new_urls(urls: list[str]) -> list[tuple[str, str]]:
+    """Return (url, url_hash) pairs for URLs not yet in items, in input order.
+
+    URLs the in-memory filter has already seen are dropped without a query; the
+    rest are confirmed with a single ANY() query. URLs that canonicalize to the
+    same hash are collapsed to their first occurrence.
+    """
+    candidates: dict[str, str] = {}
+    for url in urls:
+        if url:
+            candidates.setdefault(url_hash(url), url)
+
+    url_filter = get_url_filter()
+    if url_filter is not None:
+        candidates = {h: u for h, u in candidates.items() if not url_filter.check(h)}
+    if not candidates:
+        return []
+
+    rows = await db.fetch(
+        "SELECT url_hash FROM items WHERE url_hash = ANY($1::text[])",
+        list(candidates),
+    )
+    known = {r["url_hash"] for r in rows}
+    return [(url, h) for h, url in candidates.items() if h not in known]
+
+
+async def known_content_hashes(hashes: list[str]) -> set[str]:
+    """Return the subset of content hashes already present in items (one query)."""
+    wanted = list({h for h in hashes if h})
+    if not wanted:
+        return set()
+    rows = await db.fetch(
+        "SELECT DISTINCT content_hash FROM items WHERE content_hash = ANY($1::text[])",
+        wanted,
+    )
+    return {r["content_hash"] for r in rows}
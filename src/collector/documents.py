@@ -0,0 +1,69 @@
+"""Fetch one linked document (article page or PDF) and extract its text.
+
+Shared by every collector that follows links to articles. Bodies are read with
+http_client.fetch_page(), so oversized responses and binaries are abandoned
+mid-stream, and PDFs found behind ordinary links go to the PDF extractor instead
+of trafilatura. Aborts are counted per source in collector_stats
+(fetch_oversized, fetch_binary_dropped) alongside fetch_pdf_routed.
+"""
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from src.collector import archive, http_client, stats
+from src.collector.parsing import extract_article
+from src.collector.pdf_monitor import extract_pdf_text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Document:
+    text: str
+    title: str
+    raw_sha256: str | None
+    raw_format: str  # "html" | "pdf"
+
+
+async def record_rejection(source_id: str, url: str, exc: http_client.ContentRejected) -> None:
+    """Count an abandoned fetch against its source."""
+    if isinstance(exc, http_client.ResponseTooLarge):
+        metric = "fetch_oversized"
+    else:
+        metric = "fetch_binary_dropped"
+    logger.debug("Source %s: dropped %s (%s)", source_id, url, exc)
+    await stats.record(source_id, {metric: 1})
+
+
+async def fetch_document(
+    source_id: str, url: str, *, verify: bool = False, timeout: float = 20
+) -> Document | None:
+    """Fetch and extract one document; None if unreachable, rejected or non-200.
+
+    Raises httpx.HTTPError on transport failures.
+    """
+    try:
+        page = await http_client.fetch_page(url, verify=verify, timeout=timeout)
+    except http_client.ContentRejected as exc:
+        await record_rejection(source_id, url, exc)
+        return None
+    if page.status_code != 200:
+        return None
+    return await document_from_page(source_id, url, page)
+
+
+async def document_from_page(source_id: str, url: str, page: http_client.Page) -> Document:
+    """Extract an already-fetched 200 page: PDFs go to the PDF extractor, the rest to trafilatura."""
+    if page.kind == "pdf":
+        try:
+            text = await extract_pdf_text(page.path)
+            raw_sha = await archive.archive_file(page.path) if text else None
+        finally:
+            page.path.unlink(missing_ok=True)
+        await stats.record(source_id, {"fetch_pdf_routed": 1})
+        return Document(text, url.rstrip("/").rsplit("/", 1)[-1], raw_sha, "pdf")
+
+    text, title = await extract_article(page.text)
+    raw_sha = await archive.archive_bytes(page.content) if text else None
+    return Document(text, title, raw_sha, "html")
@@ -0,0 +1,61 @@
+"""Bounded concurrent fan-out for per-article work inside a source sweep."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, TypeVar
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+async def fan_out(
+    func: Callable[[Any], Awaitable[T | None]],
+    args: list[Any],
+    *,
+    limit: int | None = None,
+    deadline: float | None = None,
+) -> tuple[list[T], bool]:
+    """Run func(arg) for every arg, at most `limit` at once, within `deadline` seconds.
+
+    Returns (results, complete): the non-None results of calls that finished in
+    time, in input order, and whether every call finished. Calls still running
+    when the deadline hits are cancelled, so the caller can commit partial
+    results. Per-host limits are enforced by http_client itself.
+    """
+    if not args:
+        return [], True
+    limit = limit or settings.collect_fetch_concurrency
+    deadline = deadline if deadline is not None else settings.collect_sweep_deadline_seconds
+    sem = asyncio.Semaphore(limit)
+
+    async def _run(arg: Any) -> T | None:
+        async with sem:
+            return await func(arg)
+
+    tasks = [asyncio.create_task(_run(arg)) for arg in args]
+    _, pending = await asyncio.wait(tasks, timeout=deadline)
+    if pending:
+        logger.warning(
+            "Sweep deadline (%ss) hit: %d/%d fetches unfinished, committing partial results",
+            deadline, len(pending), len(tasks),
+        )
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    results: list[T] = []
+    for task in tasks:
+        if task.cancelled():
+            continue
+        exc = task.exception()
+        if exc is not None:
+            logger.debug("Fan-out task failed: %s", exc)
+            continue
+        result = task.result()
+        if result is not None:
+            results.append(result)
+    return results, not pending
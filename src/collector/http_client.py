@@ -0,0 +1,387 @@
+"""Shared pooled HTTP client for all collectors.
+
+One long-lived httpx.AsyncClient per TLS-verification mode, so connections
+(and HTTP/2 sessions) are reused across sweeps instead of paying a fresh
+TCP+TLS handshake for every article. Every request goes through a per-host
+slot that caps concurrent connections to one host and enforces
+settings.http_rate_limit_per_domain (requests/second, 0 disables).
+
+Pages are read with fetch_page(): the body is streamed under a byte cap
+(settings.fetch_max_bytes) and sniffed from its Content-Type and first bytes, so
+videos, archives and images are dropped before the download completes and PDFs
+are spooled to disk for the PDF extractor. Feeds and listing pages are polled
+with conditional_get(), which replays the stored ETag / Last-Modified
+validators so unchanged pages come back as 304. Large binaries (PDFs) are
+streamed to disk with download_to_file() under a hard size cap.
+"""
+from __future__ import annotations
+
+import asyncio
+import codecs
+import logging
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator
+from urllib.parse import urlparse
+
+import httpx
+
+from src import db
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ContentRejected(Exception):
+    """Base for responses abandoned because of their size or type."""
+
+
+class ResponseTooLarge(ContentRejected):
+    """Raised when a response body exceeds the caller's byte cap."""
+
+
+class UnsupportedContent(ContentRejected):
+    """Raised when a response is a binary (video, archive, image...) rather than a document."""
+
+
+class SourceFetchError(Exception):
+    """Raised by a fetch handler when the source itself (feed, listing, page) is unreachable."""
+
+
+# verify flag -> client (Japanese IR / trade sites often have broken certs)
+_clients: dict[bool, httpx.AsyncClient] = {}
+
+# Per-host state — created lazily inside the running loop
+_host_slots: dict[str, asyncio.Semaphore] = {}
+_host_locks: dict[str, asyncio.Lock] = {}
+_host_next_at: dict[str, float] = {}
+
+
+def get_client(verify: bool = True) -> httpx.AsyncClient:
+    """Return the shared client for the given verification mode, creating it on first use."""
+    client = _clients.get(verify)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            http2=True,
+            verify=verify,
+            follow_redirects=True,
+            timeout=30,
+            limits=httpx.Limits(
+                max_connections=settings.http_max_connections,
+                max_keepalive_connections=settings.http_max_connections,
+                keepalive_expiry=settings.http_keepalive_expiry,
+            ),
+        )
+        _clients[verify] = client
+    return client
+
+
+async def close_clients() -> None:
+    """Close all shared clients (call on shutdown)."""
+    for client in list(_clients.values()):
+        await client.aclose()
+    _clients.clear()
+    _host_slots.clear()
+    _host_locks.clear()
+    _host_next_at.clear()
+
+
+def host_key(url: str) -> str:
+    """Rate-limit key for a URL: lowercase host without www."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+async def _throttle(host: str) -> None:
+    """Space out request starts to the same host per http_rate_limit_per_domain."""
+    rate = settings.http_rate_limit_per_domain
+    if rate <= 0:
+        return
+    interval = 1.0 / rate
+    lock = _host_locks.setdefault(host, asyncio.Lock())
+    loop = asyncio.get_running_loop()
+    async with lock:
+        now = loop.time()
+        next_at = _host_next_at.get(host, now)
+        if next_at > now:
+            await asyncio.sleep(next_at - now)
+        _host_next_at[host] = max(now, next_at) + interval
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    """Hold one of the per-host connection slots, respecting the domain rate limit."""
+    host = host_key(url)
+    sem = _host_slots.get(host)
+    if sem is None:
+        sem = _host_slots[host] = asyncio.Semaphore(settings.http_max_connections_per_host)
+    async with sem:
+        await _throttle(host)
+        yield
+
+
+async def request(
+    method: str,
+    url: str,
+    *,
+    verify: bool = True,
+    timeout: float | None = None,
+    headers: dict[str, str] | None = None,
+    **kwargs: Any,
+) -> httpx.Response:
+    """Issue a request through the shared client, rate-limited per host."""
+    client = get_client(verify)
+    async with host_slot(url):
+        return await client.request(
+            method,
+            url,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            **kwargs,
+        )
+
+
+@asynccontextmanager
+async def stream(
+    method: str,
+    url: str,
+    *,
+    verify: bool = True,
+    timeout: float | None = None,
+    headers: dict[str, str] | None = None,
+) -> AsyncIterator[httpx.Response]:
+    """Open a streamed response through the shared client (body not yet read)."""
+    client = get_client(verify)
+    async with host_slot(url):
+        async with client.stream(
+            method,
+            url,
+            headers=headers,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        ) as resp:
+            yield resp
+
+
+def _declared_length(resp: httpx.Response) -> int:
+    try:
+        return int(resp.headers.get("Content-Length") or 0)
+    except ValueError:
+        return 0
+
+
+async def _spool(
+    url: str, chunks: AsyncIterator[bytes], max_bytes: int, suffix: str, first: bytes = b""
+) -> Path:
+    """Write a body to a temp file under max_bytes; partial files are removed on error."""
+    fd, name = tempfile.mkstemp(suffix=suffix)
+    path = Path(name)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(first)
+            received = len(first)
+            async for chunk in chunks:
+                received += len(chunk)
+                if received > max_bytes:
+                    raise ResponseTooLarge(f"{url}: body exceeds {max_bytes} bytes")
+                f.write(chunk)
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return path
+
+
+async def download_to_file(
+    url: str,
+    *,
+    max_bytes: int,
+    suffix: str = "",
+    verify: bool = True,
+    timeout: float | None = None,
+) -> Path:
+    """Stream a response body to a temp file, aborting past max_bytes.
+
+    Returns the temp file path; the caller owns it and must unlink it.
+    Raises ResponseTooLarge or httpx.HTTPError (partial files are removed).
+    """
+    async with stream("GET", url, verify=verify, timeout=timeout) as resp:
+        resp.raise_for_status()
+        declared = _declared_length(resp)
+        if declared > max_bytes:
+            raise ResponseTooLarge(f"{url}: Content-Length {declared} > {max_bytes}")
+        return await _spool(url, resp.aiter_bytes(), max_bytes, suffix)
+
+
+# ── Capped, sniffed page fetches ─────────────────────────────────────────
+
+_TEXT_TYPES = (
+    "text/", "application/xhtml", "application/xml", "application/rss", "application/atom",
+    "application/json", "application/ld+json",
+)
+_PDF_TYPES = ("application/pdf", "application/x-pdf")
+_UNTYPED = ("", "application/octet-stream", "binary/octet-stream")
+_BINARY_MAGIC = (
+    b"PK\x03\x04", b"\x1f\x8b", b"\x89PNG", b"\xff\xd8\xff", b"GIF8", b"RIFF", b"ID3",
+    b"OggS", b"\x1aE\xdf\xa3", b"Rar!", b"7z\xbc\xaf", b"BZh", b"\xfd7zXZ", b"MZ", b"\x7fELF",
+)
+
+
+def _media_type(content_type: str) -> str:
+    return content_type.split(";", 1)[0].strip().lower()
+
+
+def sniff_kind(content_type: str, head: bytes) -> str:
+    """'pdf', 'text' or 'binary' from the body's first bytes, then its Content-Type."""
+    if head.lstrip()[:5] == b"%PDF-":
+        return "pdf"
+    if head.startswith(_BINARY_MAGIC) or head[4:8] == b"ftyp":  # ftyp = MP4/MOV
+        return "binary"
+    media = _media_type(content_type)
+    if media in _PDF_TYPES:
+        return "pdf"
+    if media.startswith(_TEXT_TYPES):
+        return "text"
+    if media in _UNTYPED:
+        return "binary" if b"\x00" in head[:1024] else "text"
+    return "binary"
+
+
+@dataclass
+class Page:
+    """A fetched page. Text bodies are in `content`; PDFs are spooled to `path`
+    (a temp file the caller must unlink). Non-200 responses carry no body."""
+
+    response: httpx.Response  # headers/status only; the stream is closed
+    kind: str = "text"        # "text" | "pdf"
+    content: bytes = b""
+    path: Path | None = None
+
+    @property
+    def status_code(self) -> int:
+        return self.response.status_code
+
+    @property
+    def headers(self) -> httpx.Headers:
+        return self.response.headers
+
+    @property
+    def url(self) -> str:
+        return str(self.response.url)
+
+    @property
+    def encoding(self) -> str:
+        """Declared charset when Python knows it, else utf-8 (as httpx does)."""
+        declared = self.response.charset_encoding
+        if declared:
+            try:
+                codecs.lookup(declared)
+                return declared
+            except LookupError:
+                pass
+        return "utf-8"
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def raise_for_status(self) -> None:
+        self.response.raise_for_status()
+
+
+async def fetch_page(
+    url: str,
+    *,
+    max_bytes: int | None = None,
+    allow_pdf: bool = True,
+    verify: bool = True,
+    timeout: float | None = None,
+    headers: dict[str, str] | None = None,
+) -> Page:
+    """Streamed GET with a byte cap and content sniffing.
+
+    Raises UnsupportedContent as soon as the Content-Type or the first chunk
+    shows a binary (or a PDF when allow_pdf is False), and ResponseTooLarge once
+    the body passes max_bytes (default settings.fetch_max_bytes; PDFs use
+    settings.pdf_max_bytes).
+    """
+    cap = max_bytes or settings.fetch_max_bytes
+    async with stream("GET", url, verify=verify, timeout=timeout, headers=headers) as resp:
+        if resp.status_code != 200:
+            return Page(resp)
+        content_type = resp.headers.get("Content-Type", "")
+        media = _media_type(content_type)
+        if media.startswith(("video/", "audio/", "image/", "font/")) or "zip" in media:
+            raise UnsupportedContent(f"{url}: {media}")
+
+        chunks = resp.aiter_bytes()
+        first = b""
+        async for first in chunks:
+            if first:
+                break
+        kind = sniff_kind(content_type, first)
+        if kind == "binary" or (kind == "pdf" and not allow_pdf):
+            raise UnsupportedContent(f"{url}: {kind} body ({media or 'untyped'})")
+
+        declared = _declared_length(resp)
+        limit = settings.pdf_max_bytes if kind == "pdf" else cap
+        if declared > limit:
+            raise ResponseTooLarge(f"{url}: Content-Length {declared} > {limit}")
+        if kind == "pdf":
+            return Page(resp, "pdf", path=await _spool(url, chunks, limit, ".pdf", first))
+
+        body = bytearray(first)
+        async for chunk in chunks:
+            body += chunk
+            if len(body) > limit:
+                raise ResponseTooLarge(f"{url}: body exceeds {limit} bytes")
+        return Page(resp, "text", content=bytes(body))
+
+
+async def get(url: str, **kwargs: Any) -> httpx.Response:
+    return await request("GET", url, **kwargs)
+
+
+async def post(url: str, **kwargs: Any) -> httpx.Response:
+    return await request("POST", url, **kwargs)
+
+
+async def head(url: str, **kwargs: Any) -> httpx.Response:
+    return await request("HEAD", url, **kwargs)
+
+
+async def conditional_get(url: str, **kwargs: Any) -> Page:
+    """Capped fetch_page() with If-None-Match / If-Modified-Since from the last saved validators.
+
+    Callers should treat status 304 as "unchanged" and skip processing, and call
+    save_validators() only once the response has been fully processed.
+    """
+    headers = dict(kwargs.pop("headers", None) or {})
+    row = await db.fetchrow(
+        "SELECT etag, last_modified FROM http_validators WHERE url = $1", url
+    )
+    if row:
+        if row["etag"]:
+            headers["If-None-Match"] = row["etag"]
+        if row["last_modified"]:
+            headers["If-Modified-Since"] = row["last_modified"]
+    return await fetch_page(url, headers=headers, allow_pdf=False, **kwargs)
+
+
+async def save_validators(
+    url: str, resp: Page | httpx.Response, source_id: str | None = None
+) -> None:
+    """Persist the validators of a successfully processed 200 response."""
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    if resp.status_code != 200 or not (etag or last_modified):
+        return
+    await db.execute(
+        """INSERT INTO http_validators (url, source_id, etag, last_modified)
+           VALUES ($1, $2, $3, $4)
+           ON CONFLICT (url) DO UPDATE
+           SET etag = EXCLUDED.etag, last_modified = EXCLUDED.last_modified,
+               updated_at = now()""",
+        url, source_id, etag, last_modified,
+    )
@@ -0,0 +1,116 @@
+"""Static-first page fetching with Playwright fallback (fetch_method 'scrape_hybrid').
+
+A page is fetched over plain HTTP and extracted first. It is re-fetched through
+the shared render pool only when the extraction comes back thin (below the
+caller's minimum) or the HTML looks like a client-side-rendered shell, and the
+rendered result is kept only if it is actually better.
+
+The outcome is cached per domain and page kind (listing vs article, since a
+static listing says nothing about its article pages): pages that needed JS go
+straight to the renderer, ones whose static version was fine never escalate, and
+either decision expires after hybrid_reprobe_hours so sites that change stack get
+re-probed.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from typing import Awaitable, Callable, TypeVar
+
+from src.collector import http_client
+from src.collector.js_renderer import render_page
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Empty SPA mount points and "JavaScript required" notices
+_SHELL_SIGNATURES = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|__nuxt|svelte)[\"'][^>]*>\s*</div>"
+    r"|<noscript>[^<]{0,200}(?:enable|requires?|turn on)\s+javascript",
+    re.IGNORECASE,
+)
+
+# (domain, page kind) -> (needs_js, decided_at monotonic)
+_decisions: dict[tuple[str, str], tuple[bool, float]] = {}
+
+
+def looks_like_shell(html: str) -> bool:
+    return bool(_SHELL_SIGNATURES.search(html))
+
+
+def _decision(key: tuple[str, str]) -> bool | None:
+    cached = _decisions.get(key)
+    if cached is None or time.monotonic() - cached[1] > settings.hybrid_reprobe_hours * 3600:
+        return None
+    return cached[0]
+
+
+def needs_js(url: str, kind: str = "article") -> bool | None:
+    """The cached verdict for the URL's domain and page kind (None when unknown or expired)."""
+    return _decision((http_client.host_key(url), kind))
+
+
+def _decide(key: tuple[str, str], needs_js: bool) -> None:
+    previous = _decisions.get(key)
+    if previous is None or previous[0] != needs_js:
+        logger.info("Hybrid fetch: %s %s pages → %s", key[0], key[1],
+                    "Playwright" if needs_js else "static")
+    _decisions[key] = (needs_js, time.monotonic())
+
+
+async def _render(url: str, extract: Callable[[str], Awaitable[T]]) -> tuple[T, bytes] | None:
+    try:
+        html = await render_page(url)
+    except Exception as exc:
+        logger.debug("Render failed for %s: %s", url, exc)
+        return None
+    return await extract(html), html.encode("utf-8")
+
+
+async def fetch(
+    url: str,
+    extract: Callable[[str], Awaitable[T]],
+    min_size: int,
+    measure: Callable[[T], int] = len,
+    static=None,
+    kind: str = "article",
+) -> tuple[T, bytes, bool] | None:
+    """Fetch and extract a page, escalating to Playwright when needed.
+
+    Returns (extracted, raw body, rendered) or None when the page could not be
+    fetched. `static` may carry an already-fetched 200 response for the URL;
+    `kind` ("article" or "listing") selects which per-domain decision applies.
+    The static fetch is capped and sniffed (http_client.fetch_page, PDFs rejected),
+    so it may raise http_client.ContentRejected; callers that want PDFs routed
+    fetch the page themselves and pass HTML responses as `static`.
+    """
+    key = (http_client.host_key(url), kind)
+    verdict = _decision(key)
+
+    if verdict:
+        rendered = await _render(url, extract)
+        if rendered is not None:
+            return rendered[0], rendered[1], True
+
+    if static is None:
+        static = await http_client.fetch_page(url, allow_pdf=False, verify=False, timeout=20)
+        if static.status_code != 200:
+            return None
+    html = static.text
+    result = await extract(html)
+    if verdict is not None or (measure(result) >= min_size and not looks_like_shell(html)):
+        if verdict is None:
+            _decide(key, False)
+        return result, static.content, False
+
+    rendered = await _render(url, extract)
+    if rendered is None:
+        return result, static.content, False
+    better = measure(rendered[0]) > measure(result)
+    _decide(key, better)
+    if better:
+        return rendered[0], rendered[1], True
+    return result, static.content, False
@@ -1,70 +1,170 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from urllib.parse import urlparse
 
-from src import db
-from src.collector.dedup import url_hash, content_hash
+from src.collector import archive
+from src.collector.dedup import content_hash, filter_new_urls
+from src.collector.http_client import SourceFetchError
+from src.collector.parsing import extract_article
+from src.collector.store import insert_items
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
-# Lazy browser init — only import playwright when needed
-_browser = None
+# Third-party hosts that never contribute article text
+_BLOCKED_HOSTS = (
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+    "googlesyndication.com", "facebook.net", "connect.facebook.net",
+    "scorecardresearch.com", "hotjar.com", "criteo.com", "taboola.com",
+    "outbrain.com", "adservice.google.com",
+)
 
 
-async def _get_browser():
-    global _browser
-    if _browser is None:
+class RenderPool:
+    """A Playwright browser with a fixed set of reusable contexts.
+
+    Each render borrows a context, opens a page with heavy resource types
+    (settings.render_block_resources) and known trackers aborted at the network
+    layer, waits per settings.render_wait_until and returns the HTML.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self._playwright = None
+        self._browser = None
+        self._contexts: asyncio.Queue = asyncio.Queue()
+        self._all_contexts: list = []
+
+    async def start(self) -> None:
+        # Lazy import — only load playwright when a JS source actually runs
         from playwright.async_api import async_playwright
-        pw = await async_playwright().start()
-        _browser = await pw.chromium.launch(headless=True)
-    return _browser
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        for _ in range(self.size):
+            ctx = await self._browser.new_context()
+            await ctx.route("**/*", self._filter_request)
+            self._all_contexts.append(ctx)
+            self._contexts.put_nowait(ctx)
+        logger.info("Render pool started (%d contexts)", self.size)
+
+    @staticmethod
+    async def _filter_request(route) -> None:
+        request = route.request
+        host = (urlparse(request.url).hostname or "").lower()
+        if request.resource_type in settings.render_block_resources or any(
+            host == h or host.endswith("." + h) for h in _BLOCKED_HOSTS
+        ):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def render(self, url: str) -> str:
+        """Render a URL and return its HTML. Raises on timeout/navigation failure."""
+        ctx = await self._contexts.get()
+        page = None
+        try:
+            page = await ctx.new_page()
+            timeout = settings.render_timeout_seconds
+            await asyncio.wait_for(
+                page.goto(url, wait_until=settings.render_wait_until, timeout=timeout * 1000),
+                timeout=timeout + 5,
+            )
+            return await page.content()
+        finally:
+            if page is not None:
+                try:
+                    await page.close()
+                except Exception:
+                    logger.debug("Could not close page for %s", url)
+            self._contexts.put_nowait(ctx)
+
+    async def close(self) -> None:
+        for ctx in self._all_contexts:
+            try:
+                await ctx.close()
+            except Exception:
+                pass
+        self._all_contexts.clear()
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+        logger.info("Render pool closed")
+
+
+_pool: RenderPool | None = None
+_pool_lock: asyncio.Lock | None = None
+
+
+async def get_render_pool() -> RenderPool:
+    global _pool, _pool_lock
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+    async with _pool_lock:
+        if _pool is None:
+            pool = RenderPool(settings.render_contexts)
+            try:
+                await pool.start()
+            except Exception:
+                await pool.close()
+                raise
+            _pool = pool
+    return _pool
+
+
+async def close_renderer() -> None:
+    """Shut down the browser and Playwright driver (call on shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+async def render_page(url: str) -> str:
+    """Render a JS-heavy page through the shared pool and return its HTML."""
+    pool = await get_render_pool()
+    return await pool.render(url)
 
 
 async def fetch_js_source(source: dict) -> int:
     """Render a JS-heavy page with Playwright, extract text, insert items."""
-    import trafilatura
-
     source_id = source["source_id"]
     target = source.get("scrape_target") or source.get("url")
     if not target:
         return 0
 
     try:
-        browser = await _get_browser()
-        page = await browser.new_page()
-        await page.goto(target, wait_until="networkidle", timeout=30000)
-        html = await page.content()
-        await page.close()
+        html = await render_page(target)
     except Exception as exc:
-        logger.error("Playwright failed for %s: %s", target, exc)
-        return 0
+        raise SourceFetchError(f"Playwright failed for {target}: {exc}") from exc
 
-    raw_text = trafilatura.extract(html) or ""
+    raw_text, title = await extract_article(html)
     if not raw_text:
         return 0
 
-    uhash = url_hash(target)
-    exists = await db.fetchval("SELECT 1 FROM items WHERE url_hash = $1", uhash)
-    if exists:
+    fresh = await filter_new_urls([target])
+    if not fresh:
         return 0
+    _, uhash = fresh[0]
+    raw_sha = await archive.archive_bytes(html.encode("utf-8"))
 
-    chash = content_hash(raw_text)
-    dup = await db.fetchval("SELECT 1 FROM items WHERE content_hash = $1", chash)
-    if dup:
+    inserted = await insert_items([{
+        "source_id": source_id,
+        "url": target,
+        "url_hash": uhash,
+        "content_hash": content_hash(raw_text),
+        "title": title,
+        "raw_text": raw_text,
+        "language": source.get("language", "en"),
+        "raw_sha256": raw_sha,
+        "raw_format": "html" if raw_sha else None,
+    }])
+    if not inserted:
         return 0
-
-    title = ""
-    meta = trafilatura.extract_metadata(html)
-    if meta:
-        title = meta.title or ""
-
-    await db.execute(
-        """INSERT INTO items (source_id, url, url_hash, content_hash, title, raw_text,
-                              language, pipeline_status)
-           VALUES ($1, $2, $3, $4, $5, $6, $7, 'COLLECTED')
-           ON CONFLICT (url_hash) DO NOTHING""",
-        source_id, target, uhash, chash, title, raw_text,
-        source.get("language", "en"),
-    )
     logger.info("Source %s: collected 1 item via Playwright", source_id)
     return 1
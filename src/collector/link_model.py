@@ -0,0 +1,172 @@
+"""Per-source learned article-URL patterns for scrape_html link discovery.
+
+Every candidate link is reduced to a path template: numeric segments become
+{yyyy}/{n2}/{date}/{num}, opaque IDs {id}, hyphenated slugs {slug}, and short
+literal segments ("news", "tag", "category") are kept. For each source we learn,
+per template, how many fetches it took, how many produced an item and how many
+of those items produced events. Candidates are ranked by
+
+    (event_items + 0.25 * other_items + PRIOR_WEIGHT * prior) / (attempts + PRIOR_WEIGHT)
+
+where the prior is a shape heuristic (date/ID/slug paths look like articles,
+tag/category/page paths like navigation, off-site links are unlikely). Links
+scoring below settings.link_min_score are not fetched.
+
+Per-source overrides come from seed_sources.yml:
+
+    link_patterns:
+      include: ['/news/articleView\\.html']   # always fetched, ranked first
+      exclude: ['/tag/', '/author/']          # never fetched
+"""
+from __future__ import annotations
+
+import logging
+import re
+import time
+from urllib.parse import parse_qs, urlparse
+
+from src import db
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+PRIOR_WEIGHT = 2.0
+_MODEL_TTL_SECONDS = 3600
+_HISTORY_LIMIT = 1000
+
+_NAV_SEGMENTS = {
+    "tag", "tags", "category", "categories", "section", "page", "author", "authors",
+    "about", "contact", "login", "signin", "register", "search", "subscribe", "privacy",
+    "terms", "rss", "feed", "topics", "topic", "index", "sitemap", "events", "video",
+}
+_HEX_ID = re.compile(r"^[0-9a-f]{8,}$")
+_MIXED_ID = re.compile(r"^(?=.*\d)[a-z0-9_]{6,}$")
+
+# source_id -> (built_at, template -> [attempts, items, event_items])
+_models: dict[str, tuple[float, dict[str, list[int]]]] = {}
+
+
+def _segment_token(seg: str) -> str:
+    seg = seg.lower()
+    stem, dot, ext = seg.rpartition(".") if "." in seg else (seg, "", "")
+    suffix = f".{ext}" if dot and ext in ("html", "htm", "php", "aspx", "shtml") else ""
+    if not suffix:
+        stem = seg
+    if stem.isdigit():
+        if len(stem) == 4 and stem[:2] in ("19", "20"):
+            return "{yyyy}" + suffix
+        if len(stem) <= 2:
+            return "{n2}" + suffix
+        if len(stem) == 8 and stem[:2] in ("19", "20"):
+            return "{date}" + suffix
+        return "{num}" + suffix
+    if _HEX_ID.match(stem) or _MIXED_ID.match(stem):
+        return "{id}" + suffix
+    if stem.count("-") + stem.count("_") >= 2 or len(stem) > 30:
+        return "{slug}" + suffix
+    return stem + suffix
+
+
+def url_template(url: str) -> str:
+    """Shape of a URL path (and query keys), e.g. '/news/{yyyy}/{n2}/{slug}?id'."""
+    p = urlparse(url)
+    segments = [s for s in p.path.split("/") if s]
+    template = "/" + "/".join(_segment_token(s) for s in segments)
+    keys = sorted(parse_qs(p.query))
+    return template + ("?" + "&".join(keys) if keys else "")
+
+
+def _prior(url: str, base_host: str) -> float:
+    p = urlparse(url)
+    host = (p.hostname or "").lower().removeprefix("www.")
+    if host and base_host and not (host == base_host or host.endswith("." + base_host)):
+        return 0.05
+    tokens = url_template(url).lstrip("/").replace("?", "/").split("/")
+    if any(t.split(".")[0] in _NAV_SEGMENTS for t in tokens):
+        return 0.05
+    if any(t.startswith(("{date}", "{yyyy}", "{id}", "{slug}", "{num}")) for t in tokens):
+        return 0.4
+    return 0.15
+
+
+async def _load_model(source_id: str) -> dict[str, list[int]]:
+    cached = _models.get(source_id)
+    if cached and time.monotonic() - cached[0] < _MODEL_TTL_SECONDS:
+        return cached[1]
+
+    model: dict[str, list[int]] = {}
+    rows = await db.fetch(
+        """SELECT i.url, EXISTS (SELECT 1 FROM events e WHERE e.item_id = i.id) AS has_events
+           FROM items i
+           WHERE i.source_id = $1
+           ORDER BY i.fetched_at DESC
+           LIMIT $2""",
+        source_id, _HISTORY_LIMIT,
+    )
+    for r in rows:
+        entry = model.setdefault(url_template(r["url"]), [0, 0, 0])
+        entry[1] += 1
+        entry[2] += int(r["has_events"])
+    for r in await db.fetch(
+        "SELECT template, fetches FROM link_template_stats WHERE source_id = $1", source_id
+    ):
+        entry = model.setdefault(r["template"], [0, 0, 0])
+        entry[0] = r["fetches"]
+    for entry in model.values():
+        entry[0] = max(entry[0], entry[1])
+
+    _models[source_id] = (time.monotonic(), model)
+    return model
+
+
+async def rank_links(source: dict, urls: list[str], base_url: str) -> list[str]:
+    """Order candidate links by learned article likelihood, dropping unlikely ones."""
+    source_id = source["source_id"]
+    overrides = settings.seed_source(source_id).get("link_patterns") or {}
+    include = [re.compile(p) for p in overrides.get("include", [])]
+    exclude = [re.compile(p) for p in overrides.get("exclude", [])]
+    model = await _load_model(source_id)
+    base_host = (urlparse(base_url).hostname or "").lower().removeprefix("www.")
+
+    scored: list[tuple[float, int, str]] = []
+    for i, url in enumerate(urls):
+        if any(p.search(url) for p in exclude):
+            continue
+        if any(p.search(url) for p in include):
+            scored.append((2.0, i, url))
+            continue
+        attempts, items, event_items = model.get(url_template(url), (0, 0, 0))
+        score = (event_items + 0.25 * (items - event_items) + PRIOR_WEIGHT * _prior(url, base_host)) / (
+            attempts + PRIOR_WEIGHT
+        )
+        if score >= settings.link_min_score:
+            scored.append((score, i, url))
+
+    # Highest score first; page order breaks ties (listing pages lead with newest)
+    scored.sort(key=lambda t: (-t[0], t[1]))
+    if len(scored) < len(urls):
+        logger.debug("Source %s: link model kept %d/%d candidates", source_id, len(scored), len(urls))
+    return [url for _, _, url in scored]
+
+
+async def record_fetches(source_id: str, fetched: list[str], produced: list[str]) -> None:
+    """Record fetch outcomes per template in one batched upsert."""
+    produced_set = set(produced)
+    deltas: dict[str, list[int]] = {}
+    for url in fetched:
+        d = deltas.setdefault(url_template(url), [0, 0])
+        d[0] += 1
+        d[1] += url not in produced_set
+    if not deltas:
+        return
+    templates = list(deltas)
+    await db.execute(
+        """INSERT INTO link_template_stats (source_id, template, fetches, empty_fetches)
+           SELECT $1, t, f, e FROM unnest($2::text[], $3::int[], $4::int[]) AS x(t, f, e)
+           ON CONFLICT (source_id, template) DO UPDATE
+           SET fetches = link_template_stats.fetches + EXCLUDED.fetches,
+               empty_fetches = link_template_stats.empty_fetches + EXCLUDED.empty_fetches,
+               updated_at = now()""",
+        source_id, templates, [deltas[t][0] for t in templates], [deltas[t][1] for t in templates],
+    )
+    _models.pop(source_id, None)
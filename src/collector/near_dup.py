@@ -0,0 +1,116 @@
+"""SimHash near-duplicate detection for syndicated / re-published articles.
+
+content_hash only catches byte-identical text. A 64-bit SimHash over word
+3-shingles (character shingles for CJK) survives changed headers, footers and
+bylines, so the same wire story scraped from several aggregators maps to
+fingerprints a few bits apart. Fingerprints are stored in items.simhash and
+looked up through four 16-bit band indexes (migration 005): with
+near_dup_max_distance <= 3, any near-copy shares at least one band exactly.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import uuid
+
+from src import db
+from src.collector.parsing import run_parser
+from src.settings import settings
+
+_MASK64 = (1 << 64) - 1
+_BAND_SHIFTS = (48, 32, 16, 0)
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+_WORD = re.compile(r"\w+")
+
+
+def _tokens(text: str) -> list[str]:
+    tokens: list[str] = []
+    for tok in _WORD.findall(text.lower()):
+        if _CJK.search(tok):
+            tokens.extend(tok)  # no word boundaries in CJK runs — use characters
+        else:
+            tokens.append(tok)
+    return tokens
+
+
+def simhash(text: str, min_chars: int | None = None) -> int | None:
+    """Signed 64-bit SimHash of text (BIGINT-compatible), None if too short to be reliable."""
+    if len(text) < (settings.near_dup_min_chars if min_chars is None else min_chars):
+        return None
+    tokens = _tokens(text)
+    if len(tokens) < 3:
+        return None
+
+    weights = [0] * 64
+    for i in range(len(tokens) - 2):
+        shingle = " ".join(tokens[i:i + 3]).encode()
+        h = int.from_bytes(hashlib.blake2b(shingle, digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if h >> bit & 1 else -1
+
+    value = sum(1 << bit for bit in range(64) if weights[bit] > 0)
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _simhashes(texts: list[str], min_chars: int) -> list[int | None]:
+    """Worker-side batch of simhash() (module level so it pickles)."""
+    return [simhash(text, min_chars) for text in texts]
+
+
+def hamming(a: int, b: int) -> int:
+    return bin((a ^ b) & _MASK64).count("1")
+
+
+def _bands(value: int) -> list[int]:
+    return [(value >> shift) & 0xFFFF for shift in _BAND_SHIFTS]
+
+
+async def _db_candidates(fingerprints: list[int]) -> list[tuple[uuid.UUID, int]]:
+    """Recent original items sharing at least one band with any fingerprint."""
+    if not fingerprints:
+        return []
+    bands = [[_bands(fp)[i] for fp in fingerprints] for i in range(4)]
+    rows = await db.fetch(
+        """SELECT id, simhash FROM items
+           WHERE simhash IS NOT NULL
+             AND duplicate_of IS NULL
+             AND fetched_at > now() - make_interval(days => $5)
+             AND (((simhash >> 48) & 65535) = ANY($1::bigint[])
+               OR ((simhash >> 32) & 65535) = ANY($2::bigint[])
+               OR ((simhash >> 16) & 65535) = ANY($3::bigint[])
+               OR (simhash & 65535) = ANY($4::bigint[]))""",
+        *bands, settings.near_dup_window_days,
+    )
+    return [(r["id"], r["simhash"]) for r in rows]
+
+
+async def assign_near_duplicates(items: list[dict]) -> None:
+    """Fingerprint items in place and flag near-copies.
+
+    Sets item["simhash"]. A near-copy of a stored item gets item["duplicate_of"]
+    (that item's id); a near-copy of an earlier item in the same batch gets
+    item["duplicate_of_hash"] (that item's url_hash).
+    """
+    # Pure-Python shingling takes ~1 s on a long document: keep it off the event loop
+    fingerprints = await run_parser(
+        _simhashes, [item.get("raw_text") or "" for item in items], settings.near_dup_min_chars
+    )
+    for item, fp in zip(items, fingerprints):
+        item["simhash"] = fp
+
+    max_distance = settings.near_dup_max_distance
+    stored = await _db_candidates([i["simhash"] for i in items if i["simhash"] is not None])
+    seen: list[dict] = []
+    for item in items:
+        fp = item["simhash"]
+        if fp is None:
+            continue
+        match = next((item_id for item_id, other in stored if hamming(fp, other) <= max_distance), None)
+        if match is not None:
+            item["duplicate_of"] = match
+            continue
+        earlier = next((o for o in seen if hamming(fp, o["simhash"]) <= max_distance), None)
+        if earlier is not None:
+            item["duplicate_of_hash"] = earlier["url_hash"]
+            continue
+        seen.append(item)
@@ -0,0 +1,139 @@
+"""Process-pool execution layer for CPU-bound HTML / feed parsing.
+
+trafilatura and feedparser run in worker processes via run_in_executor so they
+never block LLM calls, DB writes or scheduler jobs on the event loop.
+settings.parse_workers sets the pool size (0 = the loop's default thread pool,
+useful for debugging). With settings.parse_single_pass (default) article text and
+metadata come from one trafilatura pass instead of extract + extract_metadata.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Any, Callable, TypeVar
+
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Executor | None = None
+
+
+def _get_executor() -> Executor | None:
+    global _executor
+    if _executor is None and settings.parse_workers > 0:
+        _executor = ProcessPoolExecutor(
+            max_workers=settings.parse_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=500,  # bound lxml memory growth in long-lived workers
+        )
+        logger.info("Parse pool started (%d workers)", settings.parse_workers)
+    return _executor
+
+
+def shutdown_parsers() -> None:
+    """Stop the worker processes (call on shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run_parser(func: Callable[..., T], *args: Any) -> T:
+    """Run a picklable module-level function in the parse pool."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(), func, *args)
+
+
+# ── Worker-side functions (module level so they pickle) ──────────────────
+
+def _extract_article(html: str, single_pass: bool) -> tuple[str, str]:
+    import trafilatura
+
+    if single_pass:
+        doc = trafilatura.bare_extraction(html, with_metadata=True)
+        if doc is None:
+            return "", ""
+        return doc.text or "", doc.title or ""
+
+    text = trafilatura.extract(html) or ""
+    meta = trafilatura.extract_metadata(html)
+    return text, (meta.title or "") if meta else ""
+
+
+def _extract_text(html: str) -> str:
+    import trafilatura
+
+    return trafilatura.extract(html) or ""
+
+
+class _TextCollector(HTMLParser):
+    """Plain text of an HTML fragment, with line breaks at block boundaries."""
+
+    _BLOCKS = {"p", "div", "br", "li", "h1", "h2", "h3", "h4", "h5", "h6", "tr", "blockquote"}
+    _SKIP = {"script", "style", "figcaption"}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.parts: list[str] = []
+        self._skipping = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self._SKIP:
+            self._skipping += 1
+        elif tag in self._BLOCKS:
+            self.parts.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in self._SKIP and self._skipping:
+            self._skipping -= 1
+
+    def handle_data(self, data):
+        if not self._skipping:
+            self.parts.append(data)
+
+    def text(self) -> str:
+        lines = (" ".join(line.split()) for line in "".join(self.parts).splitlines())
+        return "\n".join(line for line in lines if line)
+
+
+def _html_fragment_text(html: str) -> str:
+    parser = _TextCollector()
+    parser.feed(html)
+    parser.close()
+    return parser.text()
+
+
+def _parse_feed(text: str) -> list:
+    """Feed entries; each gets '_content_text', the plain text of its embedded body."""
+    import feedparser
+
+    entries = list(feedparser.parse(text).entries)
+    for entry in entries:
+        # content:encoded / atom:content; the longest variant is the full body
+        bodies = [c.get("value", "") for c in entry.get("content", [])]
+        body = max(bodies, key=len, default="")
+        entry["_content_text"] = _html_fragment_text(body) if body else ""
+    return entries
+
+
+# ── Async API ────────────────────────────────────────────────────────────
+
+async def extract_article(html: str) -> tuple[str, str]:
+    """Main text and title of an HTML page. Returns (text, title), '' when missing."""
+    return await run_parser(_extract_article, html, settings.parse_single_pass)
+
+
+async def extract_text(html: str) -> str:
+    """Main text of an HTML page ('' when nothing extractable)."""
+    return await run_parser(_extract_text, html)
+
+
+async def parse_feed(text: str) -> list:
+    """Parse an RSS/Atom document into feedparser entries."""
+    return await run_parser(_parse_feed, text)
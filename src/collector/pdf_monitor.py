@@ -1,13 +1,19 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from html.parser import HTMLParser
+from pathlib import Path
 from urllib.parse import urljoin
 
 import httpx
 
 from src import db
-from src.collector.dedup import url_hash, content_hash
+from src.collector import archive, http_client
+from src.collector.dedup import content_hash, filter_new_urls
+from src.collector.parsing import run_parser
+from src.collector.store import insert_items
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -20,56 +26,26 @@ async def fetch_pdf_source(source: dict) -> int:
         return 0
 
     # Fetch the page listing PDFs (verify=False for Japanese IR sites with cert issues)
-    async with httpx.AsyncClient(timeout=30, follow_redirects=True, verify=False) as client:
-        try:
-            resp = await client.get(target)
-            resp.raise_for_status()
-        except httpx.HTTPError as exc:
-            logger.error("Failed to fetch PDF listing %s: %s", target, exc)
-            return 0
+    try:
+        resp = await http_client.fetch_page(target, allow_pdf=False, verify=False, timeout=30)
+        resp.raise_for_status()
+    except (httpx.HTTPError, http_client.ContentRejected) as exc:
+        raise http_client.SourceFetchError(f"Failed to fetch PDF listing {target}: {exc}") from exc
 
     # Extract PDF links
     pdf_links = _find_pdf_links(resp.text, target)
     if not pdf_links:
         return 0
 
-    new_count = 0
-    for pdf_url in pdf_links[:10]:  # limit per sweep
-        uhash = url_hash(pdf_url)
-        exists = await db.fetchval("SELECT 1 FROM items WHERE url_hash = $1", uhash)
-        if exists:
-            continue
-
-        # Download PDF and extract text
-        try:
-            async with httpx.AsyncClient(timeout=60, follow_redirects=True, verify=False) as client:
-                pdf_resp = await client.get(pdf_url)
-                pdf_resp.raise_for_status()
-        except httpx.HTTPError:
-            logger.debug("Could not download PDF %s", pdf_url)
-            continue
-
-        raw_text = _extract_pdf_text(pdf_resp.content)
-        if not raw_text:
-            continue
-
-        chash = content_hash(raw_text)
-        dup = await db.fetchval("SELECT 1 FROM items WHERE content_hash = $1", chash)
-        if dup:
-            continue
-
-        # Use PDF filename as title
-        title = pdf_url.rsplit("/", 1)[-1] if "/" in pdf_url else pdf_url
-
-        await db.execute(
-            """INSERT INTO items (source_id, url, url_hash, content_hash, title, raw_text,
-                                  language, pipeline_status)
-               VALUES ($1, $2, $3, $4, $5, $6, $7, 'COLLECTED')
-               ON CONFLICT (url_hash) DO NOTHING""",
-            source_id, pdf_url, uhash, chash, title, raw_text,
-            source.get("language", "en"),
-        )
-        new_count += 1
+    fresh = await filter_new_urls(pdf_links[:10])  # limit per sweep
+
+    items: list[dict] = []
+    for pdf_url, uhash in fresh:
+        item = await _collect_pdf(source, pdf_url, uhash)
+        if item:
+            items.append(item)
+
+    new_count = await insert_items(items)
 
     if new_count:
         logger.info("Source %s: collected %d new PDFs", source_id, new_count)
@@ -93,16 +69,133 @@ def _find_pdf_links(html: str, base_url: str) -> list[str]:
     return links
 
 
-def _extract_pdf_text(pdf_bytes: bytes) -> str:
-    """Extract text from PDF bytes using PyMuPDF."""
+async def _collect_pdf(source: dict, pdf_url: str, uhash: str) -> dict | None:
+    """Download one PDF to disk and extract its text; None if skipped or empty."""
+    source_id = source["source_id"]
+    # Use PDF filename as title
+    title = pdf_url.rsplit("/", 1)[-1] if "/" in pdf_url else pdf_url
+
+    # HEAD pre-check: skip oversized files and re-posted copies without downloading
+    size = None
+    try:
+        head = await http_client.head(pdf_url, verify=False, timeout=20)
+        if head.status_code == 200:
+            size = int(head.headers.get("Content-Length") or 0) or None
+    except (httpx.HTTPError, ValueError):
+        pass
+    if size and size > settings.pdf_max_bytes:
+        logger.info("Skipping PDF %s: %d bytes exceeds cap", pdf_url, size)
+        return None
+    if size and await db.fetchval(
+        "SELECT 1 FROM items WHERE source_id = $1 AND title = $2 AND content_length = $3",
+        source_id, title, size,
+    ):
+        logger.debug("Skipping PDF %s: same file already collected", pdf_url)
+        return None
+
+    try:
+        path = await http_client.download_to_file(
+            pdf_url, max_bytes=settings.pdf_max_bytes, suffix=".pdf", verify=False, timeout=60,
+        )
+    except http_client.ResponseTooLarge as exc:
+        logger.info("Aborted PDF download: %s", exc)
+        return None
+    except httpx.HTTPError:
+        logger.debug("Could not download PDF %s", pdf_url)
+        return None
+
+    try:
+        size = path.stat().st_size
+        raw_text = await extract_pdf_text(path)
+        raw_sha = await archive.archive_file(path) if raw_text else None
+    finally:
+        path.unlink(missing_ok=True)
+    if not raw_text:
+        return None
+
+    return {
+        "source_id": source_id,
+        "url": pdf_url,
+        "url_hash": uhash,
+        "content_hash": content_hash(raw_text),
+        "title": title,
+        "raw_text": raw_text,
+        "language": source.get("language", "en"),
+        "content_length": size,
+        "raw_sha256": raw_sha,
+        "raw_format": "pdf" if raw_sha else None,
+    }
+
+
+async def extract_pdf_text(path: Path) -> str:
+    """Extract text from a PDF on disk, page ranges in parallel across the parse pool.
+
+    Reads at most pdf_max_pages pages, one wave of parse_workers ranges at a time,
+    and keeps ranges up to the one that brings the total past pdf_max_chars.
+    """
+    page_count = await run_parser(_pdf_page_count, str(path))
+    ranges = _page_ranges(min(page_count, settings.pdf_max_pages), settings.pdf_pages_per_task)
+    wave = max(1, settings.parse_workers)
+
+    parts: list[str] = []
+    for i in range(0, len(ranges), wave):
+        texts = await asyncio.gather(
+            *[run_parser(_pdf_pages_text, str(path), a, b) for a, b in ranges[i:i + wave]]
+        )
+        if _take_until(parts, texts, settings.pdf_max_chars):
+            break
+    return "\n".join(parts).strip()
+
+
+def _page_ranges(pages: int, step: int) -> list[tuple[int, int]]:
+    step = max(1, step)
+    return [(start, min(start + step, pages)) for start in range(0, pages, step)]
+
+
+def _take_until(parts: list[str], texts: list[str], max_chars: int) -> bool:
+    """Append range texts in order, stopping after the one that reaches max_chars.
+
+    Keeps the output independent of the wave size, so the pooled and the
+    sequential extractor return the same text for the same file.
+    """
+    chars = sum(len(p) for p in parts)
+    for text in texts:
+        parts.append(text)
+        chars += len(text)
+        if chars >= max_chars:
+            return True
+    return False
+
+
+# ── Worker-side functions (run in the parse pool) ────────────────────────
+# PyMuPDF opens the file from disk and loads pages on demand, so a 200 MB deck
+# is never held in memory as one bytes object.
+
+def _pdf_page_count(path: str) -> int:
+    try:
+        import pymupdf
+        with pymupdf.open(path) as doc:
+            return doc.page_count
+    except Exception as exc:
+        logger.debug("PDF open failed: %s", exc)
+        return 0
+
+
+def _pdf_pages_text(path: str, start: int, stop: int) -> str:
+    """Extract text from pages [start, stop) of a PDF using PyMuPDF."""
     try:
         import pymupdf
-        doc = pymupdf.open(stream=pdf_bytes, filetype="pdf")
-        text_parts = []
-        for page in doc:
-            text_parts.append(page.get_text())
-        doc.close()
-        return "\n".join(text_parts).strip()
+        with pymupdf.open(path) as doc:
+            return "\n".join(doc[i].get_text() for i in range(start, stop))
     except Exception as exc:
         logger.debug("PDF text extraction failed: %s", exc)
         return ""
+
+
+def pdf_text(path: str, max_pages: int, max_chars: int, pages_per_task: int) -> str:
+    """Sequential extract_pdf_text() for callers already running in a worker process."""
+    parts: list[str] = []
+    for a, b in _page_ranges(min(_pdf_page_count(path), max_pages), pages_per_task):
+        if _take_until(parts, [_pdf_pages_text(path, a, b)], max_chars):
+            break
+    return "\n".join(parts).strip()
@@ -1,33 +1,52 @@
-"""Query generator with round-robin rotation.
+"""Query generator with bandit-driven selection.
 
 Loads config/constraint_taxonomy.yml (a flat list of search queries per
 language) and serves them via get_next_queries(source_id, count).
-A persistent cursor per source ensures full rotation before repeating.
+
+Selection is UCB1 over observed yield per (source, query): each pull is
+rewarded for the unseen URLs it surfaced and, more heavily, for items that
+later produced events. Never-pulled queries score infinite, so a full
+rotation of the taxonomy happens before any query repeats; after that Serper
+spend drifts towards productive queries while the exploration term
+(settings.query_bandit_exploration) keeps revisiting the rest.
+
+Stats live in Postgres (search_query_stats). Pulls and rewards accumulate in
+memory and are written in one batch per sweep by flush().
 """
 from __future__ import annotations
 
-import json
 import logging
-from pathlib import Path
+import math
+import random
+import time
 
 import yaml
 
-from src.settings import PROJECT_ROOT
+from src import db
+from src.settings import PROJECT_ROOT, settings
 
 logger = logging.getLogger(__name__)
 
 TAXONOMY_PATH = PROJECT_ROOT / "config" / "constraint_taxonomy.yml"
-CURSOR_PATH = PROJECT_ROOT / "data" / "query_cursors.json"
+
+# A result page holds at most 20 organic results; an event-producing item is
+# worth EVENT_WEIGHT unseen URLs.
+_MAX_RESULTS = 20
+EVENT_WEIGHT = 5
+_EVENT_REFRESH_SECONDS = 3600
 
 # Module-level state — populated by init()
 _queries_by_source: dict[str, list[str]] = {}
-_cursors: dict[str, int] = {}
+# (source_id, query) -> [pulls, new_urls, event_items]
+_stats: dict[tuple[str, str], list[int]] = {}
+_dirty: dict[tuple[str, str], list[int]] = {}   # unflushed [pulls, new_urls] deltas
+_events_refreshed_at = 0.0
 _initialized = False
 
 
-def init() -> None:
-    """Load query lists per source. Call once at startup."""
-    global _queries_by_source, _cursors, _initialized
+async def init() -> None:
+    """Load query lists per source and their stored stats. Call once at startup."""
+    global _queries_by_source, _initialized
 
     if not TAXONOMY_PATH.exists():
         logger.warning("Taxonomy not found at %s — query generator disabled", TAXONOMY_PATH)
@@ -45,7 +64,10 @@ def init() -> None:
             combined.extend(queries_by_lang.get(lang, []))
         _queries_by_source[source_id] = combined
 
-    _cursors = _load_cursors()
+    await refresh_event_rewards()
+    rows = await db.fetch("SELECT source_id, query, pulls, new_urls, event_items FROM search_query_stats")
+    for r in rows:
+        _stats[(r["source_id"], r["query"])] = [r["pulls"], r["new_urls"], r["event_items"]]
     _initialized = True
 
     for sid, qs in _queries_by_source.items():
@@ -54,8 +76,17 @@ def init() -> None:
     logger.info("Query generator: %d total queries across %d sources", total, len(_queries_by_source))
 
 
+def _score(source_id: str, query: str, total_pulls: int) -> float:
+    pulls, new_urls, event_items = _stats.get((source_id, query), (0, 0, 0))
+    if pulls == 0:
+        return math.inf
+    mean = min(1.0, (new_urls + EVENT_WEIGHT * event_items) / (pulls * _MAX_RESULTS))
+    bonus = settings.query_bandit_exploration * math.sqrt(math.log(max(total_pulls, 1)) / pulls)
+    return mean + bonus
+
+
 def get_next_queries(source_id: str, count: int = 3) -> list[str]:
-    """Return the next `count` queries for a source, advancing the cursor."""
+    """Return the `count` highest-UCB queries for a source and record the pulls."""
     if not _initialized or source_id not in _queries_by_source:
         return []
 
@@ -63,37 +94,80 @@ def get_next_queries(source_id: str, count: int = 3) -> list[str]:
     if not queries:
         return []
 
-    cursor = _cursors.get(source_id, 0) % len(queries)
-    selected: list[str] = []
-    for i in range(count):
-        idx = (cursor + i) % len(queries)
-        selected.append(queries[idx])
-
-    _cursors[source_id] = (cursor + count) % len(queries)
-    _save_cursors()
+    total_pulls = sum(_stats.get((source_id, q), (0,))[0] for q in queries)
+    # Random tie-break so unexplored queries aren't always taken in file order
+    ranked = sorted(queries, key=lambda q: (_score(source_id, q, total_pulls), random.random()),
+                    reverse=True)
+    selected = ranked[:count]
 
+    for query in selected:
+        key = (source_id, query)
+        _stats.setdefault(key, [0, 0, 0])[0] += 1
+        _dirty.setdefault(key, [0, 0])[0] += 1
     return selected
 
 
+def record_new_urls(source_id: str, query: str, new_urls: int) -> None:
+    """Credit a query with the unseen URLs it surfaced in this sweep."""
+    if not new_urls:
+        return
+    key = (source_id, query)
+    _stats.setdefault(key, [0, 0, 0])[1] += new_urls
+    _dirty.setdefault(key, [0, 0])[1] += new_urls
+
+
+async def flush() -> None:
+    """Persist accumulated pulls/rewards in one batched write; refresh event rewards hourly."""
+    if _dirty:
+        # Detach the batch so increments made during the write start a new one;
+        # on failure it is merged back and retried on the next flush
+        batch = list(_dirty.items())
+        _dirty.clear()
+        try:
+            await db.execute(
+                """INSERT INTO search_query_stats (source_id, query, pulls, new_urls, last_used_at)
+                   SELECT s, q, p, n, now()
+                   FROM unnest($1::text[], $2::text[], $3::int[], $4::int[]) AS t(s, q, p, n)
+                   ON CONFLICT (source_id, query) DO UPDATE
+                   SET pulls = search_query_stats.pulls + EXCLUDED.pulls,
+                       new_urls = search_query_stats.new_urls + EXCLUDED.new_urls,
+                       last_used_at = now(),
+                       updated_at = now()""",
+                [k[0] for k, _ in batch], [k[1] for k, _ in batch],
+                [d[0] for _, d in batch], [d[1] for _, d in batch],
+            )
+        except BaseException:
+            for key, (pulls, new_urls) in batch:
+                pending = _dirty.setdefault(key, [0, 0])
+                pending[0] += pulls
+                pending[1] += new_urls
+            raise
+    if time.monotonic() - _events_refreshed_at > _EVENT_REFRESH_SECONDS:
+        await refresh_event_rewards()
+
+
+async def refresh_event_rewards() -> None:
+    """Recount, per query, the items it surfaced that went on to produce events."""
+    global _events_refreshed_at
+    rows = await db.fetch(
+        """WITH counts AS (
+               SELECT i.source_id, i.search_query AS query, COUNT(DISTINCT i.id) AS n
+               FROM items i JOIN events e ON e.item_id = i.id
+               WHERE i.search_query IS NOT NULL
+               GROUP BY i.source_id, i.search_query
+           )
+           UPDATE search_query_stats s SET event_items = c.n, updated_at = now()
+           FROM counts c
+           WHERE s.source_id = c.source_id AND s.query = c.query AND s.event_items <> c.n
+           RETURNING s.source_id, s.query, s.event_items"""
+    )
+    for r in rows:
+        key = (r["source_id"], r["query"])
+        if key in _stats:
+            _stats[key][2] = r["event_items"]
+    _events_refreshed_at = time.monotonic()
+
+
 def get_query_count(source_id: str) -> int:
     """Return total number of queries available for a source."""
     return len(_queries_by_source.get(source_id, []))
-
-
-def _load_cursors() -> dict[str, int]:
-    if CURSOR_PATH.exists():
-        try:
-            with open(CURSOR_PATH, "r") as f:
-                return json.load(f)
-        except (json.JSONDecodeError, OSError):
-            logger.warning("Could not load cursor file, starting fresh")
-    return {}
-
-
-def _save_cursors() -> None:
-    CURSOR_PATH.parent.mkdir(parents=True, exist_ok=True)
-    try:
-        with open(CURSOR_PATH, "w") as f:
-            json.dump(_cursors, f, indent=2)
-    except OSError:
-        logger.warning("Could not save cursor file")
@@ -3,12 +3,15 @@ from __future__ import annotations
 import logging
 from datetime import datetime, timezone
 
-import feedparser
 import httpx
-import trafilatura
 
-from src import db
-from src.collector.dedup import url_hash, content_hash
+from src.collector import http_client, stats
+from src.collector.dedup import content_hash, filter_new_urls
+from src.collector.documents import fetch_document
+from src.collector.fanout import fan_out
+from src.collector.parsing import parse_feed
+from src.collector.store import insert_items
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -21,75 +24,96 @@ async def fetch_rss_source(source: dict) -> int:
         logger.warning("Source %s has no feed_url, skipping", source_id)
         return 0
 
-    async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-        try:
-            resp = await client.get(feed_url)
-            resp.raise_for_status()
-        except httpx.HTTPError as exc:
-            logger.error("Failed to fetch RSS %s: %s", feed_url, exc)
+    try:
+        resp = await http_client.conditional_get(feed_url, timeout=30)
+        if resp.status_code == 304:
+            logger.debug("Source %s: feed unchanged (304)", source_id)
             return 0
+        resp.raise_for_status()
+    except (httpx.HTTPError, http_client.ContentRejected) as exc:
+        raise http_client.SourceFetchError(f"Failed to fetch RSS {feed_url}: {exc}") from exc
+
+    feed_entries = await parse_feed(resp.text)
+    entries = {e.get("link", ""): e for e in feed_entries if e.get("link")}
+
+    # One query for the whole feed; only unseen links are fetched
+    fresh = await filter_new_urls(list(entries))
+
+    # Full-text feeds: the embedded body is the article, no page fetch needed
+    min_chars = settings.seed_source(source_id).get(
+        "full_content_min_chars", settings.rss_full_content_min_chars
+    )
+    embedded = [p for p in fresh if len(entries[p[0]].get("_content_text", "")) >= min_chars]
+    teasers = [p for p in fresh if len(entries[p[0]].get("_content_text", "")) < min_chars]
+
+    items, complete = await fan_out(
+        lambda pair: _collect_entry(source, entries[pair[0]], *pair), teasers
+    )
+    items += [
+        _build_item(source, entries[link], link, uhash, entries[link]["_content_text"])
+        for link, uhash in embedded
+    ]
+    new_count = await insert_items(items)
+    await stats.record(source_id, {
+        "rss_embedded_content": len(embedded),
+        "article_fetches": len(teasers),
+    })
+    # A sweep cut short by the deadline must re-download the feed next time
+    if complete:
+        await http_client.save_validators(feed_url, resp, source_id)
 
-    feed = feedparser.parse(resp.text)
-    new_count = 0
-
-    for entry in feed.entries:
-        link = entry.get("link", "")
-        if not link:
-            continue
-
-        uhash = url_hash(link)
+    if new_count:
+        logger.info("Source %s: collected %d new items", source_id, new_count)
+    return new_count
 
-        # Check if already collected
-        exists = await db.fetchval(
-            "SELECT 1 FROM items WHERE url_hash = $1", uhash
-        )
-        if exists:
-            continue
 
-        # Try to extract full text via trafilatura
-        title = entry.get("title", "")
-        raw_text = ""
+async def _collect_entry(source: dict, entry, link: str, uhash: str) -> dict:
+    """Fetch full text for one feed entry and build its item row."""
+    # Try to extract full text via trafilatura
+    doc = None
+    try:
+        doc = await fetch_document(source["source_id"], link, verify=True, timeout=20)
+    except Exception:
+        logger.debug("Could not fetch full text for %s", link)
+    if doc and doc.text:
+        return _build_item(source, entry, link, uhash, doc.text, doc.raw_sha256, doc.raw_format)
+
+    # Fall back to the embedded body / RSS summary if no full text
+    raw_text = (
+        entry.get("_content_text", "")
+        or entry.get("summary", "")
+        or entry.get("description", "")
+    )
+    return _build_item(source, entry, link, uhash, raw_text)
+
+
+def _build_item(
+    source: dict,
+    entry,
+    link: str,
+    uhash: str,
+    raw_text: str,
+    raw_sha: str | None = None,
+    raw_format: str | None = None,
+) -> dict:
+    """Item row for a feed entry."""
+    # Parse published date
+    published_at = None
+    if hasattr(entry, "published_parsed") and entry.published_parsed:
         try:
-            async with httpx.AsyncClient(timeout=20, follow_redirects=True) as client:
-                article_resp = await client.get(link)
-                if article_resp.status_code == 200:
-                    extracted = trafilatura.extract(article_resp.text)
-                    raw_text = extracted or ""
+            published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
         except Exception:
-            logger.debug("Could not fetch full text for %s", link)
-
-        # Fall back to RSS summary if no full text
-        if not raw_text:
-            raw_text = entry.get("summary", "") or entry.get("description", "")
-
-        # Parse published date
-        published_at = None
-        if hasattr(entry, "published_parsed") and entry.published_parsed:
-            try:
-                published_at = datetime(*entry.published_parsed[:6], tzinfo=timezone.utc)
-            except Exception:
-                pass
-
-        chash = content_hash(raw_text) if raw_text else None
-
-        # Content-level dedup
-        if chash:
-            dup = await db.fetchval(
-                "SELECT 1 FROM items WHERE content_hash = $1", chash
-            )
-            if dup:
-                continue
-
-        await db.execute(
-            """INSERT INTO items (source_id, url, url_hash, content_hash, title, raw_text,
-                                  language, published_at, pipeline_status)
-               VALUES ($1, $2, $3, $4, $5, $6, $7, $8, 'COLLECTED')
-               ON CONFLICT (url_hash) DO NOTHING""",
-            source_id, link, uhash, chash, title, raw_text,
-            source.get("language", "en"), published_at,
-        )
-        new_count += 1
-
-    if new_count:
-        logger.info("Source %s: collected %d new items", source_id, new_count)
-    return new_count
+            pass
+
+    return {
+        "source_id": source["source_id"],
+        "url": link,
+        "url_hash": uhash,
+        "content_hash": content_hash(raw_text) if raw_text else None,
+        "title": entry.get("title", ""),
+        "raw_text": raw_text,
+        "language": source.get("language", "en"),
+        "published_at": published_at,
+        "raw_sha256": raw_sha,
+        "raw_format": raw_format if raw_sha else None,
+    }
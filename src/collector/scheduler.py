@@ -1,16 +1,23 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
+from datetime import datetime, timedelta, timezone
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
 
 from src import db
+from src.collector import adaptive
+from src.collector.http_client import SourceFetchError
 from src.collector.rss import fetch_rss_source
-from src.collector.scraper import fetch_scrape_html_source
+from src.collector.scraper import fetch_hybrid_source, fetch_scrape_html_source
 from src.collector.js_renderer import fetch_js_source
 from src.collector.pdf_monitor import fetch_pdf_source
+from src.collector.sitemap import fetch_sitemap_source
 from src.collector.web_search import fetch_web_search_source
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -18,43 +25,134 @@ FETCH_DISPATCH = {
     "rss": fetch_rss_source,
     "scrape_html": fetch_scrape_html_source,
     "scrape_js": fetch_js_source,
+    "scrape_hybrid": fetch_hybrid_source,
     "pdf_monitor": fetch_pdf_source,
     "web_search": fetch_web_search_source,
+    "sitemap": fetch_sitemap_source,
 }
 
 
-async def _collect_source(source: dict) -> None:
-    """Dispatch a single source to its fetch handler."""
+_scheduler: AsyncIOScheduler | None = None
+
+# Created lazily inside the running loop
+_global_slots: asyncio.Semaphore | None = None
+_shared_slots: asyncio.Semaphore | None = None
+_method_slots: dict[str, asyncio.Semaphore] = {}
+
+
+def _get_global_slots() -> asyncio.Semaphore:
+    global _global_slots
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(settings.collect_global_concurrency)
+    return _global_slots
+
+
+def _get_shared_slots() -> asyncio.Semaphore:
+    """Global slots open to non-RSS methods (the rest are reserved for RSS)."""
+    global _shared_slots
+    if _shared_slots is None:
+        reserved = min(settings.collect_rss_reserved_slots, settings.collect_global_concurrency - 1)
+        _shared_slots = asyncio.Semaphore(settings.collect_global_concurrency - max(0, reserved))
+    return _shared_slots
+
+
+def _get_method_slots(method: str) -> asyncio.Semaphore:
+    sem = _method_slots.get(method)
+    if sem is None:
+        size = settings.collect_method_concurrency.get(method, 1)
+        sem = _method_slots[method] = asyncio.Semaphore(size)
+    return sem
+
+
+async def _run_source(source: dict) -> int:
+    """Dispatch a single source under the global and per-method caps. Returns new items.
+
+    The per-method slot is taken first so a backlog of slow Playwright/PDF work
+    waits in its own pool. Non-RSS methods also need one of the shared slots, so
+    they can never hold more than collect_global_concurrency minus
+    collect_rss_reserved_slots global slots and RSS always has capacity left.
+    """
     method = source.get("fetch_method", "")
     handler = FETCH_DISPATCH.get(method)
     if not handler:
         logger.warning("Unknown fetch_method '%s' for source %s", method, source.get("source_id"))
+        return 0
+    shared = contextlib.nullcontext() if method == "rss" else _get_shared_slots()
+    async with _get_method_slots(method), shared, _get_global_slots():
+        try:
+            count = await handler(source)
+        except Exception:
+            await _after_run(source, 0, failed=True)
+            raise
+    await _after_run(source, count, failed=False)
+    return count
+
+
+async def _after_run(source: dict, new_items: int, failed: bool) -> None:
+    """Record the run's yield and move the source's job to its adapted interval."""
+    try:
+        minutes = await adaptive.record_run(source, new_items, failed)
+    except Exception:
+        logger.exception("Could not record run for %s", source["source_id"])
         return
+
+    job = _scheduler.get_job(f"collect:{source['source_id']}") if _scheduler else None
+    if job is not None and job.trigger.interval.total_seconds() != minutes * 60:
+        logger.info("Source %s: interval → %d min", source["source_id"], minutes)
+        job = job.reschedule(trigger=_interval_trigger(minutes))
+
+    # Persist the next fire time so a restart resumes the schedule
+    next_run = job.next_run_time if job is not None and job.next_run_time else (
+        datetime.now(timezone.utc) + timedelta(minutes=minutes)
+    )
     try:
-        await handler(source)
+        await adaptive.save_next_run(source["source_id"], next_run)
+    except Exception:
+        logger.exception("Could not save next run for %s", source["source_id"])
+
+
+def _interval_trigger(minutes: int) -> IntervalTrigger:
+    jitter = int(minutes * 60 * settings.schedule_jitter_fraction)
+    return IntervalTrigger(minutes=minutes, jitter=jitter or None)
+
+
+async def _collect_source(source: dict) -> None:
+    """Scheduler job: collect one source, logging (not raising) failures."""
+    try:
+        await _run_source(source)
+    except SourceFetchError as exc:
+        logger.error("%s", exc)
     except Exception:
         logger.exception("Error collecting source %s", source.get("source_id"))
 
 
 def build_scheduler() -> AsyncIOScheduler:
     """Build APScheduler with a job per active source."""
+    global _scheduler
     scheduler = AsyncIOScheduler()
+    _scheduler = scheduler
     return scheduler
 
 
-async def load_source_jobs(scheduler: AsyncIOScheduler) -> None:
-    """Load sources from DB and add/update scheduler jobs."""
+async def _confirmed_sources() -> list[dict]:
     rows = await db.fetch(
         """SELECT source_id, name, url, feed_url, fetch_method, scrape_target,
                   language, tier, reliability, earliness, schedule_minutes,
                   layers, search_queries, notes
            FROM sources WHERE status = 'CONFIRMED'"""
     )
+    return [dict(r) for r in rows]
+
 
-    for row in rows:
-        source = dict(row)
+async def load_source_jobs(scheduler: AsyncIOScheduler) -> None:
+    """Load sources from DB and add/update scheduler jobs, resuming persisted run times."""
+    rows = await _confirmed_sources()
+    state = await adaptive.load_schedule_state()
+    now = datetime.now(timezone.utc)
+
+    for source in rows:
         job_id = f"collect:{source['source_id']}"
-        minutes = source.get("schedule_minutes", 60)
+        minutes, next_run = adaptive.resume_schedule(source, state.get(source["source_id"]), now)
 
         # Remove existing job if present (for reload)
         if scheduler.get_job(job_id):
@@ -62,57 +160,53 @@ async def load_source_jobs(scheduler: AsyncIOScheduler) -> None:
 
         scheduler.add_job(
             _collect_source,
-            "interval",
-            minutes=minutes,
+            _interval_trigger(minutes),
             args=[source],
             id=job_id,
             name=f"Collect {source['name']}",
             replace_existing=True,
             max_instances=1,
+            next_run_time=next_run,
         )
 
     logger.info("Loaded %d source collection jobs", len(rows))
 
 
-async def run_all_sources_once() -> int:
-    """Run all confirmed sources once (for initial collection). Returns total new items."""
-    rows = await db.fetch(
-        """SELECT source_id, name, url, feed_url, fetch_method, scrape_target,
-                  language, tier, reliability, earliness, schedule_minutes,
-                  layers, search_queries, notes
-           FROM sources WHERE status = 'CONFIRMED'"""
-    )
-    total = 0
-    rss_sources = [dict(r) for r in rows if r["fetch_method"] == "rss"]
-    other_sources = [dict(r) for r in rows if r["fetch_method"] != "rss"]
-
-    # RSS sources first (most likely to work on first run)
-    logger.info("Collecting %d RSS sources...", len(rss_sources))
-    for i, source in enumerate(rss_sources, 1):
-        handler = FETCH_DISPATCH.get("rss")
-        if handler:
-            try:
-                logger.info("  [%d/%d] %s (%s)", i, len(rss_sources), source["name"], source["feed_url"] or "no feed")
-                count = await handler(source)
-                total += count
-                if count:
-                    logger.info("         → %d new items", count)
-            except Exception:
-                logger.exception("  [%d/%d] ERROR: %s", i, len(rss_sources), source["source_id"])
-
-    # Other fetch methods
-    logger.info("Collecting %d non-RSS sources (scrape/pdf/api/search)...", len(other_sources))
-    for i, source in enumerate(other_sources, 1):
-        method = source.get("fetch_method", "")
-        handler = FETCH_DISPATCH.get(method)
-        if handler:
-            try:
-                logger.info("  [%d/%d] [%s] %s", i, len(other_sources), method, source["name"])
-                count = await handler(source)
-                total += count
-                if count:
-                    logger.info("         → %d new items", count)
-            except Exception:
-                logger.exception("  [%d/%d] ERROR: %s", i, len(other_sources), source["source_id"])
-
-    return total
+async def run_all_sources_once(stale_only: bool = False) -> int:
+    """Run all confirmed sources once, concurrently (for initial collection).
+
+    With stale_only, only sources whose last successful run is older than their
+    interval are collected (warm restart). Returns total new items. Concurrency
+    is bounded by the same global and per-method pools the scheduled jobs use.
+    """
+    rows = await _confirmed_sources()
+    if stale_only:
+        state = await adaptive.load_schedule_state()
+        now = datetime.now(timezone.utc)
+        stale = [r for r in rows if adaptive.is_stale(r, state.get(r["source_id"]), now)]
+        logger.info("Skipping %d sources collected within their interval", len(rows) - len(stale))
+        rows = stale
+    # RSS first: tasks are queued in creation order, and feeds are the most likely to work
+    sources = sorted(rows, key=lambda r: r["fetch_method"] != "rss")
+    logger.info("Collecting %d sources concurrently (cap %d)...",
+                len(sources), settings.collect_global_concurrency)
+
+    done = 0
+
+    async def _one(source: dict) -> int:
+        nonlocal done
+        try:
+            count = await _run_source(source)
+        except SourceFetchError as exc:
+            logger.error("  ERROR: %s", exc)
+            count = 0
+        except Exception:
+            logger.exception("  ERROR: %s", source["source_id"])
+            count = 0
+        done += 1
+        logger.info("  [%d/%d] [%s] %s → %d new items",
+                    done, len(sources), source["fetch_method"], source["name"], count)
+        return count
+
+    counts = await asyncio.gather(*[_one(s) for s in sources])
+    return sum(counts)
@@ -4,83 +4,138 @@ import logging
 from urllib.parse import urljoin
 
 import httpx
-import trafilatura
 
-from src import db
-from src.collector.dedup import url_hash, content_hash
+from src.collector import archive, http_client, hybrid, link_model
+from src.collector.dedup import content_hash, filter_new_urls
+from src.collector.documents import document_from_page, fetch_document, record_rejection
+from src.collector.fanout import fan_out
+from src.collector.parsing import extract_article, run_parser
+from src.collector.store import insert_items
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
 
 async def fetch_scrape_html_source(source: dict) -> int:
     """Scrape an HTML source: discover article links, extract text, insert items."""
+    return await _scrape(source, use_hybrid=False)
+
+
+async def fetch_hybrid_source(source: dict) -> int:
+    """Like scrape_html, but pages escalate to Playwright when static HTML is not enough."""
+    return await _scrape(source, use_hybrid=True)
+
+
+async def _scrape(source: dict, use_hybrid: bool) -> int:
     source_id = source["source_id"]
     target = source.get("scrape_target") or source.get("url")
     if not target:
         return 0
 
-    async with httpx.AsyncClient(timeout=30, follow_redirects=True, verify=False) as client:
-        try:
-            resp = await client.get(target)
-            resp.raise_for_status()
-        except httpx.HTTPError as exc:
-            logger.error("Failed to scrape %s: %s", target, exc)
+    try:
+        resp = await http_client.conditional_get(target, verify=False, timeout=30)
+        if resp.status_code == 304:
+            logger.debug("Source %s: listing unchanged (304)", source_id)
             return 0
+        resp.raise_for_status()
+    except (httpx.HTTPError, http_client.ContentRejected) as exc:
+        raise http_client.SourceFetchError(f"Failed to scrape {target}: {exc}") from exc
 
     # Discover article links from the listing page
-    links = trafilatura.extract_metadata(resp.text)
-    # Use trafilatura's link extraction for article URLs
-    article_urls = _extract_article_links(resp.text, target)
+    async def find_links(html: str) -> list[str]:
+        return await run_parser(_extract_article_links, html, target)
 
+    if use_hybrid:
+        listing = await hybrid.fetch(target, find_links, min_size=1, static=resp, kind="listing")
+        article_urls = listing[0] if listing else []
+    else:
+        article_urls = await find_links(resp.text)
+
+    deferred = 0
     if not article_urls:
         # If no links found, try to extract text directly from the page
-        article_urls = [target]
-
-    new_count = 0
-    for url in article_urls[:20]:  # limit to 20 per sweep
-        uhash = url_hash(url)
-        exists = await db.fetchval("SELECT 1 FROM items WHERE url_hash = $1", uhash)
-        if exists:
-            continue
-
-        # Fetch and extract article
-        raw_text = ""
-        title = ""
-        try:
-            async with httpx.AsyncClient(timeout=20, follow_redirects=True, verify=False) as client:
-                art_resp = await client.get(url)
-                if art_resp.status_code == 200:
-                    raw_text = trafilatura.extract(art_resp.text) or ""
-                    meta = trafilatura.extract_metadata(art_resp.text)
-                    if meta:
-                        title = meta.title or ""
-        except Exception:
-            logger.debug("Could not fetch %s", url)
-            continue
-
-        if not raw_text:
-            continue
-
-        chash = content_hash(raw_text)
-        dup = await db.fetchval("SELECT 1 FROM items WHERE content_hash = $1", chash)
-        if dup:
-            continue
-
-        await db.execute(
-            """INSERT INTO items (source_id, url, url_hash, content_hash, title, raw_text,
-                                  language, pipeline_status)
-               VALUES ($1, $2, $3, $4, $5, $6, $7, 'COLLECTED')
-               ON CONFLICT (url_hash) DO NOTHING""",
-            source_id, url, uhash, chash, title, raw_text,
-            source.get("language", "en"),
-        )
-        new_count += 1
+        fresh = await filter_new_urls([target])
+    else:
+        # Rank unseen links by the source's learned URL patterns; limit to 20 per sweep
+        unseen = dict(await filter_new_urls(article_urls))
+        ranked = await link_model.rank_links(source, list(unseen), target)
+        fresh = [(url, unseen[url]) for url in ranked[:20]]
+        deferred = len(ranked) - len(fresh)
+
+    items, complete = await fan_out(
+        lambda pair: _collect_article(source, *pair, use_hybrid=use_hybrid), fresh
+    )
+    new_count = await insert_items(items)
+    await link_model.record_fetches(source_id, [u for u, _ in fresh], [i["url"] for i in items])
+    # A sweep cut short by the deadline or the per-sweep link cap must
+    # re-download the listing next time instead of getting a 304
+    if complete and not deferred:
+        await http_client.save_validators(target, resp, source_id)
+    elif deferred:
+        logger.debug("Source %s: %d ranked links left for the next sweep", source_id, deferred)
 
     if new_count:
         logger.info("Source %s: scraped %d new items", source_id, new_count)
     return new_count
 
 
+async def _collect_article(
+    source: dict, url: str, uhash: str, use_hybrid: bool = False
+) -> dict | None:
+    """Fetch and extract one article; None if it yields no text."""
+    raw_text = ""
+    title = ""
+    raw_sha = raw_format = None
+    try:
+        doc = None
+        if use_hybrid and not url.lower().endswith(".pdf"):
+            static = None
+            if not hybrid.needs_js(url):
+                # Fetch the static page here so PDFs behind ordinary URLs reach the
+                # PDF extractor; HTML is handed on to the hybrid fetch
+                static = await http_client.fetch_page(url, verify=False, timeout=20)
+                if static.status_code != 200:
+                    return None
+                if static.kind == "pdf":
+                    doc = await document_from_page(source["source_id"], url, static)
+            if doc is None:
+                fetched = await hybrid.fetch(
+                    url, extract_article, settings.hybrid_min_chars,
+                    measure=lambda r: len(r[0]), static=static,
+                )
+                if fetched:
+                    (raw_text, title), body, _ = fetched
+                    raw_sha = await archive.archive_bytes(body) if raw_text else None
+                    raw_format = "html"
+        else:
+            doc = await fetch_document(source["source_id"], url)
+        if doc:
+            raw_text, title, raw_sha, raw_format = (
+                doc.text, doc.title, doc.raw_sha256, doc.raw_format
+            )
+    except http_client.ContentRejected as exc:
+        await record_rejection(source["source_id"], url, exc)
+        return None
+    except Exception:
+        logger.debug("Could not fetch %s", url)
+        return None
+
+    if not raw_text:
+        return None
+
+    return {
+        "source_id": source["source_id"],
+        "url": url,
+        "url_hash": uhash,
+        "content_hash": content_hash(raw_text),
+        "title": title,
+        "raw_text": raw_text,
+        "language": source.get("language", "en"),
+        "raw_sha256": raw_sha,
+        "raw_format": raw_format if raw_sha else None,
+    }
+
+
 def _extract_article_links(html: str, base_url: str) -> list[str]:
     """Extract plausible article links from an HTML page."""
     from html.parser import HTMLParser
@@ -0,0 +1,31 @@
+"""Per-day collector counters (collector_stats table)."""
+from __future__ import annotations
+
+from src import db
+
+
+async def record(source_id: str, counts: dict[str, int]) -> None:
+    """Add counts to today's counters for a source in one statement; zeros are skipped."""
+    metrics = [(m, n) for m, n in counts.items() if n]
+    if not metrics:
+        return
+    await db.execute(
+        """INSERT INTO collector_stats (day, source_id, metric, value)
+           SELECT CURRENT_DATE, $1, m, v FROM unnest($2::text[], $3::bigint[]) AS t(m, v)
+           ON CONFLICT (day, source_id, metric)
+           DO UPDATE SET value = collector_stats.value + EXCLUDED.value""",
+        source_id, [m for m, _ in metrics], [n for _, n in metrics],
+    )
+
+
+async def set_gauges(source_id: str, values: dict[str, int]) -> None:
+    """Overwrite today's value of point-in-time metrics (e.g. memory use) for a source."""
+    if not values:
+        return
+    await db.execute(
+        """INSERT INTO collector_stats (day, source_id, metric, value)
+           SELECT CURRENT_DATE, $1, m, v FROM unnest($2::text[], $3::bigint[]) AS t(m, v)
+           ON CONFLICT (day, source_id, metric)
+           DO UPDATE SET value = EXCLUDED.value""",
+        source_id, list(values), list(values.values()),
+    )
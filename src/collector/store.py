@@ -0,0 +1,88 @@
+"""Bulk insertion of collected items into the work queue."""
+from __future__ import annotations
+
+import logging
+
+from src import db
+from src.collector.dedup import known_content_hashes
+from src.collector.near_dup import assign_near_duplicates
+from src.collector.url_filter import add_url_hashes
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = (
+    "source_id", "url", "url_hash", "content_hash", "title", "raw_text",
+    "language", "published_at", "content_length", "simhash", "duplicate_of",
+    "search_query", "raw_sha256", "raw_format",
+)
+
+
+async def insert_items(items: list[dict]) -> int:
+    """Insert new items in bulk. Returns count inserted as COLLECTED.
+
+    Each item is a dict keyed by _COLUMNS (all but the first three may be None).
+    Items whose content_hash is already stored — or repeated within the batch —
+    are dropped before insert; url_hash conflicts are ignored. Near-duplicates
+    of a recent item (SimHash) are stored as SKIPPED with duplicate_of set, so
+    they never reach translation or LLM extraction.
+    """
+    if not items:
+        return 0
+
+    known = await known_content_hashes([i.get("content_hash") for i in items])
+    batch: list[dict] = []
+    for item in items:
+        chash = item.get("content_hash")
+        if chash:
+            if chash in known:
+                continue
+            known.add(chash)
+        batch.append(item)
+    if not batch:
+        return 0
+
+    await assign_near_duplicates(batch)
+    originals = [i for i in batch if not i.get("duplicate_of") and not i.get("duplicate_of_hash")]
+    copies = [i for i in batch if i.get("duplicate_of") or i.get("duplicate_of_hash")]
+
+    inserted = await _insert(originals, "COLLECTED", None)
+    ids = {r["url_hash"]: r["id"] for r in inserted}
+
+    if copies:
+        for item in copies:
+            if item.get("duplicate_of_hash"):
+                item["duplicate_of"] = ids.get(item["duplicate_of_hash"])
+        linked = [i for i in copies if i.get("duplicate_of")]
+        orphans = [i for i in copies if not i.get("duplicate_of")]  # batch original lost a race
+        skipped = await _insert(linked, "SKIPPED", "near_duplicate")
+        inserted += await _insert(orphans, "COLLECTED", None)
+        if skipped:
+            logger.info("Stored %d near-duplicate items as SKIPPED", len(skipped))
+
+    add_url_hashes([r["url_hash"] for r in inserted])
+    return len(inserted)
+
+
+async def _insert(items: list[dict], status: str, error: str | None) -> list:
+    """INSERT ... SELECT FROM unnest() for one status. Returns (id, url_hash) rows."""
+    if not items:
+        return []
+    columns = [[item.get(col) for item in items] for col in _COLUMNS]
+    return await db.fetch(
+        """INSERT INTO items (source_id, url, url_hash, content_hash, title, raw_text,
+                              language, published_at, content_length, simhash,
+                              duplicate_of, search_query, raw_sha256, raw_format,
+                              pipeline_status, pipeline_error)
+           SELECT source_id, url, url_hash, content_hash, title, raw_text,
+                  language, published_at, content_length, simhash,
+                  duplicate_of, search_query, raw_sha256, raw_format, $15, $16
+           FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[],
+                       $6::text[], $7::text[], $8::timestamptz[], $9::bigint[],
+                       $10::bigint[], $11::uuid[], $12::text[], $13::text[], $14::text[])
+                AS t(source_id, url, url_hash, content_hash, title, raw_text,
+                     language, published_at, content_length, simhash, duplicate_of,
+                     search_query, raw_sha256, raw_format)
+           ON CONFLICT (url_hash) DO NOTHING
+           RETURNING id, url_hash""",
+        *columns, status, error,
+    )
@@ -0,0 +1,115 @@
+"""In-memory Bloom filter of collected items.url_hash values.
+
+Loaded once at startup and updated on every insert, so URLs we have already
+ingested are rejected without a Postgres round-trip. Only URLs the filter has
+never seen ("probably new") are confirmed against the items table, which also
+catches rows inserted by other processes (scripts, backfills).
+
+A Bloom positive is never checked against the DB, so a brand-new URL is
+dropped with probability ~error_rate; stats() reports the live estimate.
+"""
+from __future__ import annotations
+
+import logging
+import math
+
+from src import db
+from src.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Bloom filter keyed by hex SHA-256 digests (bit positions via double hashing)."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+        self.hits = 0      # lookups answered "already seen" without a DB query
+        self.misses = 0    # lookups passed on to the DB as probably new
+
+    def _positions(self, hex_digest: str) -> list[int]:
+        h1 = int(hex_digest[:16], 16)
+        h2 = int(hex_digest[16:32], 16) | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def add(self, hex_digest: str) -> None:
+        for pos in self._positions(hex_digest):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, hex_digest: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(hex_digest))
+
+    def check(self, hex_digest: str) -> bool:
+        """Membership test that also updates the hit/miss counters."""
+        seen = hex_digest in self
+        if seen:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return seen
+
+    def estimated_fpr(self) -> float:
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def stats(self) -> dict:
+        return {
+            "entries": self.count,
+            "capacity": self.capacity,
+            "size_bytes": len(self._bits),
+            "num_hashes": self.num_hashes,
+            "estimated_fpr": round(self.estimated_fpr(), 6),
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+_filter: BloomFilter | None = None
+
+
+def get_url_filter() -> BloomFilter | None:
+    """The loaded filter, or None before load_url_filter() / when disabled."""
+    return _filter
+
+
+async def load_url_filter() -> None:
+    """Build the filter from every url_hash in items. Call once at startup."""
+    global _filter
+    if not settings.url_filter_enabled:
+        return
+
+    total = await db.fetchval("SELECT COUNT(*) FROM items") or 0
+    bloom = BloomFilter(max(settings.url_filter_capacity, total * 2), settings.url_filter_error_rate)
+
+    pool = await db.get_pool()
+    async with pool.acquire() as conn:
+        async with conn.transaction():
+            async for row in conn.cursor("SELECT url_hash FROM items", prefetch=10_000):
+                bloom.add(row["url_hash"])
+
+    _filter = bloom
+    logger.info("URL filter loaded: %s", bloom.stats())
+
+
+def add_url_hashes(hashes: list[str]) -> None:
+    """Record newly inserted url_hashes (no-op when the filter is not loaded)."""
+    if _filter is None:
+        return
+    before = _filter.count
+    for h in hashes:
+        _filter.add(h)
+    if before <= _filter.capacity < _filter.count:
+        logger.warning(
+            "URL filter over capacity (%d > %d); FPR now ~%.4f — restart to resize",
+            _filter.count, _filter.capacity, _filter.estimated_fpr(),
+        )
+
+
+def log_url_filter_stats() -> None:
+    if _filter is not None:
+        logger.info("URL filter: %s", _filter.stats())
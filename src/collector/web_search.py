@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import random
 
-import httpx
-import trafilatura
-
 from src import db
-from src.collector.dedup import url_hash, content_hash
-from src.collector.query_generator import get_next_queries
+from src.collector import http_client, query_generator, stats
+from src.collector.dedup import content_hash, filter_new_urls, url_hash
+from src.collector.documents import fetch_document
+from src.collector.fanout import fan_out
+from src.collector.store import insert_items
 from src.settings import settings
 
 logger = logging.getLogger(__name__)
@@ -21,65 +23,88 @@ async def fetch_web_search_source(source: dict) -> int:
         logger.debug("No SERPER_API_KEY set, skipping web search for %s", source_id)
         return 0
 
-    # Use taxonomy-driven queries with round-robin rotation; fall back to hardcoded
-    selected = get_next_queries(source_id, count=3)
+    # Use taxonomy-driven queries chosen by observed yield; fall back to hardcoded
+    selected = query_generator.get_next_queries(source_id, count=3)
     if not selected:
         fallback = source.get("search_queries", [])
         if not fallback:
             return 0
         selected = random.sample(fallback, min(3, len(fallback)))
     logger.debug("Web search %s queries: %s", source_id, selected)
-    new_count = 0
 
+    results: list[dict] = []
+    cache_hits = 0
     for query in selected:
-        results = await _serper_search(query, source.get("language", "en"))
-        for result in results:
-            url = result.get("link", "")
-            if not url:
-                continue
-
-            uhash = url_hash(url)
-            exists = await db.fetchval("SELECT 1 FROM items WHERE url_hash = $1", uhash)
-            if exists:
-                continue
-
-            title = result.get("title", "")
-            snippet = result.get("snippet", "")
-
-            # Try to fetch full article text
-            raw_text = snippet
-            try:
-                async with httpx.AsyncClient(timeout=15, follow_redirects=True, verify=False) as client:
-                    resp = await client.get(url)
-                    if resp.status_code == 200:
-                        extracted = trafilatura.extract(resp.text)
-                        if extracted and len(extracted) > len(snippet):
-                            raw_text = extracted
-            except Exception:
-                pass  # fall back to snippet
-
-            chash = content_hash(raw_text)
-            dup = await db.fetchval("SELECT 1 FROM items WHERE content_hash = $1", chash)
-            if dup:
-                continue
-
-            await db.execute(
-                """INSERT INTO items (source_id, url, url_hash, content_hash, title, raw_text,
-                                      language, pipeline_status)
-                   VALUES ($1, $2, $3, $4, $5, $6, $7, 'COLLECTED')
-                   ON CONFLICT (url_hash) DO NOTHING""",
-                source_id, url, uhash, chash, title, raw_text,
-                source.get("language", "en"),
-            )
-            new_count += 1
+        organic, cached = await _serper_search(query, source.get("language", "en"))
+        results.extend({**r, "_query": query} for r in organic)
+        cache_hits += cached
+
+    # Dedup across queries by canonical URL before any fetch happens
+    by_hash: dict[str, dict] = {}
+    for result in results:
+        if result.get("link"):
+            by_hash.setdefault(url_hash(result["link"]), result)
+    by_url = {r["link"]: r for r in by_hash.values()}
+
+    fresh = await filter_new_urls(list(by_url))
+
+    # Reward each query for the unseen URLs it surfaced (first query wins on overlap)
+    for url, _ in fresh:
+        query_generator.record_new_urls(source_id, by_url[url]["_query"], 1)
+
+    items, _ = await fan_out(lambda pair: _collect_result(source, by_url[pair[0]], *pair), fresh)
+    new_count = await insert_items(items)
+    await query_generator.flush()
+
+    await stats.record(source_id, {
+        "serper_calls": len(selected) - cache_hits,
+        "serper_cache_hits": cache_hits,
+        "search_results": len(results),
+        "fetches_saved_duplicate": len(results) - len(by_url),
+        "fetches_saved_known": len(by_url) - len(fresh),
+        "article_fetches": len(fresh),
+    })
 
     if new_count:
         logger.info("Web search %s: found %d new items", source_id, new_count)
     return new_count
 
 
-async def _serper_search(query: str, language: str = "en") -> list[dict]:
-    """Call Serper.dev Google Search API and return organic results."""
+async def _collect_result(source: dict, result: dict, url: str, uhash: str) -> dict:
+    """Fetch full text for one search result, falling back to its snippet."""
+    title = result.get("title", "")
+    snippet = result.get("snippet", "")
+
+    # Try to fetch full article text
+    raw_text = snippet
+    raw_sha = raw_format = None
+    try:
+        doc = await fetch_document(source["source_id"], url, timeout=15)
+        if doc and len(doc.text) > len(snippet):
+            raw_text, raw_sha, raw_format = doc.text, doc.raw_sha256, doc.raw_format
+    except Exception:
+        pass  # fall back to snippet
+
+    return {
+        "source_id": source["source_id"],
+        "url": url,
+        "url_hash": uhash,
+        "content_hash": content_hash(raw_text),
+        "title": title,
+        "raw_text": raw_text,
+        "language": source.get("language", "en"),
+        "search_query": result.get("_query"),
+        "raw_sha256": raw_sha,
+        "raw_format": raw_format if raw_sha else None,
+    }
+
+
+async def _serper_search(query: str, language: str = "en") -> tuple[list[dict], bool]:
+    """Return (organic results, served_from_cache) for a query.
+
+    Results are cached per (query, hl, gl, window) for serper_cache_ttl_hours,
+    so overlapping queries across consecutive runs don't spend Serper calls.
+    """
     # Map language codes to Google search params
     lang_map = {
         "en": ("en", "us"),
@@ -93,6 +118,16 @@ async def _serper_search(query: str, language: str = "en") -> list[dict]:
         "zh-tw": ("zh-tw", "tw"),
     }
     hl, gl = lang_map.get(language, ("en", "us"))
+    window = "qdr:w"  # past week
+
+    cache_key = hashlib.sha256(f"{query}|{hl}|{gl}|{window}".encode()).hexdigest()
+    cached = await db.fetchval(
+        """SELECT results FROM serper_cache
+           WHERE cache_key = $1 AND fetched_at > now() - make_interval(secs => $2)""",
+        cache_key, settings.serper_cache_ttl_hours * 3600,
+    )
+    if cached is not None:
+        return (json.loads(cached) if isinstance(cached, str) else cached), True
 
     headers = {
         "X-API-KEY": settings.serper_api_key,
@@ -103,19 +138,28 @@ async def _serper_search(query: str, language: str = "en") -> list[dict]:
         "num": 20,
         "hl": hl,
         "gl": gl,
-        "tbs": "qdr:w",  # past week
+        "tbs": window,
     }
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        try:
-            resp = await client.post(
-                "https://google.serper.dev/search",
-                headers=headers,
-                json=body,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            return data.get("organic", [])
-        except Exception as exc:
-            logger.error("Serper search failed for '%s': %s", query, exc)
-            return []
+    try:
+        resp = await http_client.post(
+            "https://google.serper.dev/search",
+            headers=headers,
+            json=body,
+            timeout=15,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        organic = data.get("organic", [])
+    except Exception as exc:
+        logger.error("Serper search failed for '%s': %s", query, exc)
+        return [], False
+
+    await db.execute(
+        """INSERT INTO serper_cache (cache_key, query, hl, gl, time_window, results)
+           VALUES ($1, $2, $3, $4, $5, $6)
+           ON CONFLICT (cache_key) DO UPDATE
+           SET results = EXCLUDED.results, fetched_at = now()""",
+        cache_key, query, hl, gl, window, json.dumps(organic),
+    )
+    return organic, False
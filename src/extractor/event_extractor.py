@@ -1,13 +1,16 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import re
 import uuid
 
 from src import db
 from src.llm import llm_extract
 from src.models import ConstraintEvent, ExtractionResult
 from src.linker.entity_discovery import discover_entity
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -55,19 +58,79 @@ Return valid JSON matching this schema:
 }"""
 
 
+_LINE_BREAKS = re.compile(r"\n+")
+
+
+def _windows(text: str, size: int) -> list[str]:
+    """Split text into consecutive windows of at most `size` characters at line breaks."""
+    if len(text) <= size:
+        return [text]
+    windows: list[str] = []
+    current = ""
+    for paragraph in _LINE_BREAKS.split(text):
+        while len(paragraph) > size:  # one oversized paragraph: hard split
+            if current:
+                windows.append(current)
+                current = ""
+            windows.append(paragraph[:size])
+            paragraph = paragraph[size:]
+        if current and len(current) + len(paragraph) + 1 > size:
+            windows.append(current)
+            current = ""
+        current = f"{current}\n{paragraph}" if current else paragraph
+    if current.strip():
+        windows.append(current)
+    return windows
+
+
+def _event_key(event: ConstraintEvent) -> tuple:
+    return (
+        event.event_type, event.constraint_layer, event.direction,
+        frozenset(e.entity_id for e in event.entities),
+        json.dumps(event.magnitude.model_dump(exclude_none=True), sort_keys=True),
+    )
+
+
 async def extract_events(item_id: str, text: str, source: dict) -> ExtractionResult:
-    """Run LLM extraction on article text. Returns ExtractionResult."""
+    """Run LLM extraction on article text. Returns ExtractionResult.
+
+    Text longer than extract_chunk_chars (up to extract_max_chars) is split into
+    windows extracted concurrently under the shared LLM semaphore; their events
+    are merged, keeping the most confident copy of an event found twice.
+    """
     if not text or len(text.strip()) < 50:
         return ExtractionResult(skipped=True, skip_reason="text_too_short")
 
-    # Truncate very long articles
-    truncated = text[:12000] if len(text) > 12000 else text
+    windows = _windows(text[: settings.extract_max_chars], settings.extract_chunk_chars)
+    if len(windows) == 1:
+        return await _extract_window(item_id, windows[0], source)
 
+    results = await asyncio.gather(
+        *[_extract_window(item_id, w, source, (i, len(windows))) for i, w in enumerate(windows, 1)]
+    )
+    merged: dict[tuple, ConstraintEvent] = {}
+    for result in results:
+        for event in result.events:
+            key = _event_key(event)
+            if key not in merged or event.confidence > merged[key].confidence:
+                merged[key] = event
+    if not merged:
+        reasons = {r.skip_reason for r in results if r.skip_reason}
+        return ExtractionResult(skipped=True, skip_reason="; ".join(sorted(reasons)) or "llm_skipped")
+    logger.debug("Item %s: %d events from %d windows", item_id, len(merged), len(windows))
+    return ExtractionResult(events=list(merged.values()))
+
+
+async def _extract_window(
+    item_id: str, text: str, source: dict, part: tuple[int, int] | None = None
+) -> ExtractionResult:
+    """One extraction call; `part` is (index, total) when the article was split."""
+    label = f"Article text (part {part[0]} of {part[1]}):" if part else "Article text:"
     user_prompt = f"""Source: {source.get('name', 'unknown')} (tier {source.get('tier', 2)}, {source.get('language', 'en')})
 URL: {source.get('url', '')}
 
-Article text:
-{truncated}
+{label}
+{text}
 
 Extract constraint events as JSON."""
 
@@ -171,6 +234,25 @@ async def extract_and_store(item_id: str) -> int:
         )
         count += 1
 
+    # Feeds adaptive scheduling: share of a source's items that yield events
+    # (relevant_items_total counts over the same window as new_items_total).
+    # Counted only the first time an item produces events, so items re-run by
+    # scripts/backfill.py or scripts/reextract_archive.py are not counted again.
+    await db.execute(
+        """WITH first_time AS (
+               UPDATE items SET relevant_counted_at = now()
+               WHERE id = $1 AND relevant_counted_at IS NULL
+               RETURNING source_id
+           ), counted AS (
+               UPDATE sources SET relevant_article_count = relevant_article_count + 1,
+                      updated_at = now()
+               WHERE source_id IN (SELECT source_id FROM first_time)
+           )
+           UPDATE source_state SET relevant_items_total = relevant_items_total + 1
+           WHERE source_id IN (SELECT source_id FROM first_time)""",
+        row["id"],
+    )
+
     # Discover new entities from extracted events
     for event in result.events:
         for ent in event.entities:
@@ -46,6 +46,12 @@ async def _ensure_loaded():
         await load_alias_index()
 
 
+async def get_alias_index() -> dict[str, str]:
+    """The current alias -> entity_id index (replaced, not mutated, on reload)."""
+    await _ensure_loaded()
+    return _alias_index
+
+
 async def link_entities_in_text(
     text: str,
     item_id: str,
@@ -1,42 +1,204 @@
+"""Language detection for the normalize stage.
+
+detect_languages() handles a whole normalize batch: each text is cut to a
+bounded prefix (lang_detect_sample_chars), items whose declared source language
+is confirmed by its script (kana, with or without Han → ja, Hangul → ko, Han without kana → zh,
+Devanagari → hi) skip lingua entirely, and the rest go through lingua's
+multi-text parallel API in a worker thread so the event loop keeps serving LLM
+and DB I/O. The lingua detector itself is imported and built on first use.
+"""
 from __future__ import annotations
 
+import asyncio
 import logging
+import os
+import threading
+import time
 
-from lingua import Language, LanguageDetectorBuilder
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
-# Build detector once — supports the languages we care about
-_SUPPORTED = [
-    Language.ENGLISH, Language.JAPANESE, Language.KOREAN, Language.CHINESE,
-    Language.GERMAN, Language.FRENCH, Language.SPANISH, Language.PORTUGUESE,
-    Language.HINDI,
-]
-_detector = LanguageDetectorBuilder.from_languages(*_SUPPORTED).build()
-
-# Map lingua Language to ISO 639-1 codes
+# lingua Language names we detect -> ISO 639-1 codes
 _LANG_MAP = {
-    Language.ENGLISH: "en",
-    Language.JAPANESE: "ja",
-    Language.KOREAN: "ko",
-    Language.CHINESE: "zh",
-    Language.GERMAN: "de",
-    Language.FRENCH: "fr",
-    Language.SPANISH: "es",
-    Language.PORTUGUESE: "pt",
-    Language.HINDI: "hi",
+    "ENGLISH": "en",
+    "JAPANESE": "ja",
+    "KOREAN": "ko",
+    "CHINESE": "zh",
+    "GERMAN": "de",
+    "FRENCH": "fr",
+    "SPANISH": "es",
+    "PORTUGUESE": "pt",
+    "HINDI": "hi",
 }
 
+# Built on first use, not at import: lingua's models cost seconds and hundreds of
+# MB, and most processes importing this module (API, scripts) never detect anything
+_detector = None
+_detector_lock = threading.Lock()
+_detector_stats: dict = {}
+_rss_before_build = 0
+
+
+def _rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_detector():
+    """The shared lingua detector, built on first call (thread-safe).
+
+    settings.lang_detect_low_accuracy trades accuracy on short texts for much
+    smaller models; settings.lang_detect_preload loads every model up front
+    instead of on demand.
+    """
+    global _detector, _rss_before_build
+    if _detector is not None:
+        return _detector
+    with _detector_lock:
+        if _detector is None:
+            from lingua import Language, LanguageDetectorBuilder
+
+            started, _rss_before_build = time.perf_counter(), _rss_bytes()
+            builder = LanguageDetectorBuilder.from_languages(
+                *(getattr(Language, name) for name in _LANG_MAP)
+            )
+            if settings.lang_detect_low_accuracy:
+                builder = builder.with_low_accuracy_mode()
+            if settings.lang_detect_preload:
+                builder = builder.with_preloaded_language_models()
+            _detector = builder.build()
+            _detector_stats.update(
+                build_seconds=round(time.perf_counter() - started, 2),
+                low_accuracy=settings.lang_detect_low_accuracy,
+                preloaded=settings.lang_detect_preload,
+            )
+            if settings.lang_detect_preload:
+                _record_rss("build")
+            logger.info("Language detector ready: %s", _detector_stats)
+    return _detector
+
+
+def _record_rss(measured_after: str) -> None:
+    _detector_stats.update(
+        rss_delta_mb=round((_rss_bytes() - _rss_before_build) / 2**20, 1),
+        rss_measured_after=measured_after,
+    )
+    logger.info("Language detector memory: %s", _detector_stats)
+
+
+def detector_stats() -> dict:
+    """Build time and RSS growth of the detector ({} before first use).
+
+    With lang_detect_preload the RSS delta is taken once every model is loaded;
+    otherwise models load on demand, so it is taken after the first lingua batch
+    and rss_delta_mb is absent until then.
+    """
+    return dict(_detector_stats)
+
+
+async def warm_up() -> None:
+    """Build the detector in a worker thread (e.g. at startup when preloading)."""
+    await asyncio.to_thread(get_detector)
+
+
+def _iso(language) -> str:
+    return _LANG_MAP.get(language.name, "en")
+
+
+# Script ranges that identify a language on their own
+_SCRIPTS = {
+    "ja": (("\u3040", "\u30ff"),),                          # hiragana + katakana
+    "ko": (("\uac00", "\ud7af"), ("\u1100", "\u11ff")),    # Hangul
+    "zh": (("\u4e00", "\u9fff"), ("\u3400", "\u4dbf")),    # Han
+    "hi": (("\u0900", "\u097f"),),                          # Devanagari
+}
+
+
+def _in_script(c: str, lang: str) -> bool:
+    return any(lo <= c <= hi for lo, hi in _SCRIPTS[lang])
+
+
+def _script_share(sample: str, lang: str) -> float:
+    """Share of the sample's letters written in the script of `lang`."""
+    letters = [c for c in sample if c.isalpha()]
+    if not letters:
+        return 0.0
+    if lang == "ja":
+        # Japanese mixes kana with Han, but Han alone is just as likely Chinese:
+        # only a real amount of kana confirms it
+        kana = sum(1 for c in letters if _in_script(c, "ja"))
+        if kana / len(letters) < settings.lang_detect_min_kana_share:
+            return 0.0
+        han = sum(1 for c in letters if _in_script(c, "zh"))
+        return (kana + han) / len(letters)
+    if lang == "zh" and any(_in_script(c, "ja") for c in letters):
+        return 0.0
+    return sum(1 for c in letters if _in_script(c, lang)) / len(letters)
+
+
+def _from_prior(sample: str, declared: str | None) -> tuple[str, float] | None:
+    """The declared language when the script alone confirms it, else None."""
+    if declared not in _SCRIPTS:
+        return None
+    share = _script_share(sample, declared)
+    if share >= settings.lang_detect_prior_min_share:
+        return declared, round(share, 3)
+    return None
+
+
+def _pick(values, declared: str | None) -> tuple[str, float]:
+    """Top lingua result, preferring the declared language when it is nearly as likely."""
+    if not values:
+        return "en", 0.0
+    top = values[0]
+    if declared:
+        for v in values:
+            if _iso(v.language) == declared and v.value >= top.value - 0.2:
+                return declared, round(v.value, 3)
+    return _iso(top.language), round(top.value, 3)
+
 
 def detect_language(text: str) -> tuple[str, float]:
     """Detect language of text. Returns (iso_code, confidence)."""
     if not text or len(text.strip()) < 10:
         return "en", 0.0
 
-    results = _detector.compute_language_confidence_values(text)
-    if not results:
-        return "en", 0.0
+    sample = text[: settings.lang_detect_sample_chars]
+    return _pick(get_detector().compute_language_confidence_values(sample), None)
+
+
+async def detect_languages(
+    texts: list[str], declared: list[str | None] | None = None
+) -> list[tuple[str, float]]:
+    """Detect a batch of texts, using each item's declared language as a prior.
+
+    Returns (iso_code, confidence) per text, in order.
+    """
+    declared = declared or [None] * len(texts)
+    results: list[tuple[str, float] | None] = [None] * len(texts)
+    pending: list[int] = []
+    for i, (text, prior) in enumerate(zip(texts, declared)):
+        if not text or len(text.strip()) < 10:
+            results[i] = ("en", 0.0)
+            continue
+        sample = text[: settings.lang_detect_sample_chars]
+        results[i] = _from_prior(sample, prior)
+        if results[i] is None:
+            pending.append(i)
 
-    top = results[0]
-    iso = _LANG_MAP.get(top.language, "en")
-    return iso, round(top.value, 3)
+    if pending:
+        samples = [texts[i][: settings.lang_detect_sample_chars] for i in pending]
+        values = await asyncio.to_thread(
+            lambda: get_detector().compute_language_confidence_values_in_parallel(samples)
+        )
+        for i, v in zip(pending, values):
+            results[i] = _pick(v, declared[i])
+        if "rss_delta_mb" not in _detector_stats:
+            _record_rss("first_batch")
+    return results
@@ -0,0 +1,104 @@
+"""Cheap native-language relevance prefilter, run before any LLM call.
+
+An item's original-language title + text (first relevance_sample_chars) is
+scored against two local vocabularies:
+
+- entity aliases from the linker's multilingual alias index (2 points each)
+- keywords of the item language's search queries in config/constraint_taxonomy.yml,
+  plus the English ones, since tickers and technical terms appear untranslated
+  in Asian-language text (1 point each)
+
+Each distinct match counts once. Items scoring below relevance_min_score are
+sent straight to SKIPPED, so they are never translated or extracted.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from functools import lru_cache
+
+import yaml
+
+from src.linker.entity_linker import get_alias_index
+from src.settings import PROJECT_ROOT, settings
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_PATH = PROJECT_ROOT / "config" / "constraint_taxonomy.yml"
+
+ENTITY_WEIGHT = 2
+
+# Query words that say nothing about supply chains on their own
+_STOPWORDS = {
+    "and", "the", "for", "with", "from", "news", "2024", "2025", "2026", "time", "risk",
+    "de", "del", "la", "el", "en", "para", "com", "do", "da", "dos", "und", "der", "die", "das",
+}
+
+# lingua / ISO codes -> taxonomy query languages
+_QUERY_LANGS = {"zh": ["zh", "zh-tw"]}
+
+# (id of the alias dict they were built from, compiled patterns)
+_alias_patterns: tuple[int, list[re.Pattern]] | None = None
+
+
+@lru_cache
+def _keywords(lang: str) -> frozenset[str]:
+    if not TAXONOMY_PATH.exists():
+        return frozenset()
+    with open(TAXONOMY_PATH, "r", encoding="utf-8") as f:
+        queries = (yaml.safe_load(f) or {}).get("queries", {})
+    words: set[str] = set()
+    for query_lang in _QUERY_LANGS.get(lang, [lang]):
+        for query in queries.get(query_lang, []):
+            for word in str(query).lower().split():
+                if word not in _STOPWORDS and (len(word) >= 3 or not word.isascii()):
+                    words.add(word)
+    return frozenset(words)
+
+
+def _compile(terms) -> list[re.Pattern]:
+    """Alternation patterns: word-bounded for ASCII terms, plain substring for CJK etc.
+
+    ASCII boundaries are ASCII-only, so "TSMC와" or "HBM供給" still match.
+    """
+    terms = list(terms)
+    ascii_terms = sorted((t for t in terms if t.isascii()), key=len, reverse=True)
+    other = sorted((t for t in terms if not t.isascii()), key=len, reverse=True)
+    patterns = []
+    if ascii_terms:
+        alternation = "|".join(map(re.escape, ascii_terms))
+        patterns.append(re.compile(r"(?<![a-z0-9])(?:" + alternation + r")(?![a-z0-9])"))
+    if other:
+        patterns.append(re.compile("|".join(map(re.escape, other))))
+    return patterns
+
+
+@lru_cache
+def _keyword_patterns(lang: str) -> list[re.Pattern]:
+    return _compile(_keywords(lang) | _keywords("en"))
+
+
+async def _aliases() -> tuple[dict[str, str], list[re.Pattern]]:
+    global _alias_patterns
+    index = await get_alias_index()
+    if _alias_patterns is None or _alias_patterns[0] != id(index):
+        _alias_patterns = (id(index), _compile(a for a in index if len(a) >= 2))
+    return index, _alias_patterns[1]
+
+
+async def score_relevance(text: str, lang: str) -> tuple[int, list[str]]:
+    """Relevance score of original-language text and the matched terms (for logging)."""
+    sample = text[: settings.relevance_sample_chars].lower()
+    index, alias_patterns = await _aliases()
+
+    entities: set[str] = set()
+    for pattern in alias_patterns:
+        for m in pattern.finditer(sample):
+            entities.add(index.get(m.group(0), m.group(0)))
+
+    keywords: set[str] = set()
+    for pattern in _keyword_patterns(lang):
+        keywords.update(m.group(0) for m in pattern.finditer(sample))
+
+    score = ENTITY_WEIGHT * len(entities) + len(keywords)
+    return score, sorted(entities) + sorted(keywords)
@@ -1,8 +1,32 @@
+"""LLM translation to English: paragraph cache + chunked, parallel translation.
+
+Texts are split into units — paragraphs, with paragraphs longer than a chunk
+split further at sentence boundaries. Each unit is looked up in
+translation_cache by (source language, SHA-256 of its normalized form, model).
+The misses are packed in order into chunks of about translate_chunk_tokens
+estimated tokens and translated concurrently (bounded by the shared LLM
+semaphore), one call per chunk with numbered segment markers, then stitched back
+in the original order. Syndicated stories, boilerplate and items re-run by
+scripts/backfill.py cost (almost) nothing the second time.
+
+Each chunk gets a confidence from checkable signals (markers preserved, numbers
+carried over, no untranslated source script left, plausible length ratio). The
+document confidence is the length-weighted mean over its units. Only non-empty
+translations at or above translate_cache_min_confidence are cached.
+"""
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
+import re
+import unicodedata
 
+from dataclasses import dataclass, field
+
+from src import db
 from src.llm import llm_extract
+from src.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -21,26 +45,274 @@ Rules:
 
 Output ONLY the translated text, nothing else."""
 
+SEGMENTS_INSTRUCTION = (
+    "The text is split into numbered segments. Translate each segment separately and "
+    "output every segment's marker line (e.g. <<1>>) unchanged, followed by its translation."
+)
 
-async def translate_to_english(text: str, source_lang: str) -> tuple[str, float]:
-    """Translate text to English using LLM. Returns (translated_text, confidence).
-    If text is already English, returns it unchanged."""
+_MARKER = re.compile(r"^<<(\d+)>>[ \t]*$", re.MULTILINE)
+_SEPARATOR = re.compile(r"(\n+)")
+_SENTENCE_END = re.compile(r"(?<=[。．！？!?])|(?<=[.;])(?=\s)")
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_CJK = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af\u0900-\u097f]")
+
+
+@dataclass
+class Translation:
+    text: str
+    confidence: float
+    meta: dict = field(default_factory=dict)  # stored as items.translation_meta
+
+
+def _normalize(paragraph: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", paragraph).split())
+
+
+def _text_hash(paragraph: str) -> str:
+    return hashlib.sha256(_normalize(paragraph).encode("utf-8")).hexdigest()
+
+
+def _needs_translation(paragraph: str) -> bool:
+    return any(c.isalpha() for c in paragraph)
+
+
+def _estimate_tokens(text: str) -> int:
+    """Rough token count: ~1 per CJK/Hangul character, ~4 characters per token otherwise."""
+    cjk = len(_CJK.findall(text))
+    return cjk + (len(text) - cjk) // 4 + 1
+
+
+def _model() -> str:
+    return settings.load_llm_config()["model"]
+
+
+def _split_long(paragraph: str, budget: int) -> list[str]:
+    """Split a paragraph over the chunk budget at sentence boundaries."""
+    if _estimate_tokens(paragraph) <= budget:
+        return [paragraph]
+    pieces: list[str] = []
+    current = ""
+    for sentence in (s for s in _SENTENCE_END.split(paragraph) if s):
+        if current and _estimate_tokens(current + sentence) > budget:
+            pieces.append(current)
+            current = ""
+        current += sentence
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def _pack(units: list[str], budget: int) -> list[list[int]]:
+    """Group unit indices, in order, into chunks of at most ~budget tokens."""
+    chunks: list[list[int]] = []
+    used = budget + 1
+    for i, unit in enumerate(units):
+        cost = _estimate_tokens(unit)
+        if used + cost > budget:
+            chunks.append([])
+            used = 0
+        chunks[-1].append(i)
+        used += cost
+    return chunks
+
+
+def _chunk_confidence(source: str, translated: str, structured: bool) -> float:
+    """Heuristic confidence of one translated chunk from checkable signals."""
+    if not translated.strip():
+        return 0.0
+    confidence = 0.95 if structured else 0.8
+
+    source_nfkc = unicodedata.normalize("NFKC", source)
+    numbers = {n.replace(",", "") for n in _NUMBER.findall(source_nfkc)}
+    if numbers:
+        carried = {n.replace(",", "") for n in _NUMBER.findall(translated)}
+        confidence *= 0.6 + 0.4 * len(numbers & carried) / len(numbers)
+
+    residual = len(_CJK.findall(translated)) / max(1, len(translated))
+    confidence *= max(0.0, 1 - 2 * residual)
+
+    ratio = _estimate_tokens(translated) / _estimate_tokens(source)
+    if not 0.4 <= ratio <= 3.0:
+        confidence *= 0.7
+    return round(confidence, 3)
+
+
+async def _cached(
+    source_lang: str, hashes: list[str], model: str
+) -> dict[str, tuple[str, float]]:
+    if not hashes:
+        return {}
+    rows = await db.fetch(
+        """UPDATE translation_cache
+           SET hits = hits + 1, last_used_at = now()
+           WHERE source_lang = $1 AND model = $2 AND text_hash = ANY($3::text[])
+           RETURNING text_hash, translation, confidence""",
+        source_lang, model, hashes,
+    )
+    return {r["text_hash"]: (r["translation"], 0.85 if r["confidence"] is None else r["confidence"]) for r in rows}
+
+
+async def _store(
+    source_lang: str, model: str, translations: dict[str, tuple[str, float]]
+) -> None:
+    # Weak or empty translations are not cached: a cache hit is reused forever
+    hashes = [
+        h for h, (t, c) in translations.items()
+        if t.strip() and c >= settings.translate_cache_min_confidence
+    ]
+    if not hashes:
+        return
+    await db.execute(
+        """INSERT INTO translation_cache (source_lang, text_hash, model, translation, confidence)
+           SELECT $1, h, $2, t, c FROM unnest($3::text[], $4::text[], $5::real[]) AS x(h, t, c)
+           ON CONFLICT (source_lang, text_hash, model) DO NOTHING""",
+        source_lang, model, hashes,
+        [translations[h][0] for h in hashes], [translations[h][1] for h in hashes],
+    )
+
+
+def _parse_segments(output: str, count: int) -> list[str] | None:
+    """Split marker-delimited LLM output into `count` segments; None if malformed.
+
+    An empty segment counts as malformed: the unit was dropped, not translated.
+    """
+    pieces = _MARKER.split(output)
+    # pieces = [preamble, n1, text1, n2, text2, ...]
+    numbers = [int(n) for n in pieces[1::2]]
+    if numbers != list(range(1, count + 1)):
+        return None
+    segments = [t.strip() for t in pieces[2::2]]
+    return segments if all(segments) else None
+
+
+async def _translate_one(text: str, source_lang: str) -> str:
+    prompt = f"Translate the following {source_lang} text to English:\n\n{text}"
+    return (await llm_extract(prompt, system=TRANSLATE_SYSTEM, temperature=0.1)).strip()
+
+
+async def _translate_chunk(units: list[str], source_lang: str) -> tuple[list[str], float]:
+    """Translate one chunk of units in one LLM call. Returns (translations, confidence).
+
+    Falls back to one call per unit when the segment markers come back malformed.
+    """
+    source = "\n".join(units)
+    if len(units) == 1:
+        translated = [await _translate_one(units[0], source_lang)]
+        return translated, _chunk_confidence(source, translated[0], structured=True)
+
+    body = "\n".join(f"<<{i}>>\n{u}" for i, u in enumerate(units, 1))
+    prompt = (
+        f"Translate the following {source_lang} text to English.\n"
+        f"{SEGMENTS_INSTRUCTION}\n\n{body}"
+    )
+    output = await llm_extract(prompt, system=TRANSLATE_SYSTEM, temperature=0.1)
+    segments = _parse_segments(output, len(units))
+    structured = segments is not None
+    if not structured:
+        logger.warning(
+            "Segmented translation malformed (%d segments); retrying per unit", len(units)
+        )
+        segments = list(await asyncio.gather(*[_translate_one(u, source_lang) for u in units]))
+    return segments, _chunk_confidence(source, "\n".join(segments), structured)
+
+
+async def translate_document(text: str, source_lang: str) -> Translation:
+    """Translate a document of any length to English (see module docstring)."""
     if source_lang == "en":
-        return text, 1.0
+        return Translation(text, 1.0)
 
     if not text or len(text.strip()) < 20:
-        return text, 0.0
+        return Translation(text, 0.0)
 
-    # Truncate very long texts
-    truncated = text[:15000] if len(text) > 15000 else text
+    # Safety cap only — long documents are chunked, not truncated
+    truncated = len(text) > settings.translate_max_chars
+    parts = _SEPARATOR.split(text[: settings.translate_max_chars])
+    budget = settings.translate_chunk_tokens
 
-    prompt = f"Translate the following {source_lang} text to English:\n\n{truncated}"
+    # Even indices are paragraphs, odd ones the newline runs between them.
+    # units: (part index, text); a long paragraph contributes several units
+    units: list[tuple[int, str]] = []
+    for i, part in enumerate(parts):
+        if i % 2 == 0 and _needs_translation(part):
+            units.extend((i, piece) for piece in _split_long(part, budget))
+    hashes = [_text_hash(u) for _, u in units]
 
+    model = _model()
     try:
-        translated = await llm_extract(prompt, system=TRANSLATE_SYSTEM, temperature=0.1)
-        # Rough confidence: higher for shorter texts (less room for error)
-        confidence = 0.85 if len(text) < 5000 else 0.75
-        return translated.strip(), confidence
+        cache = await _cached(source_lang, list(set(hashes)), model)
     except Exception as exc:
-        logger.error("Translation failed for %s text: %s", source_lang, exc)
-        return text, 0.0
+        logger.error("Translation cache lookup failed for %s text: %s", source_lang, exc)
+        return Translation(text, 0.0, {"error": str(exc)[:200]})
+
+    misses: dict[str, str] = {}
+    for h, (_, unit) in zip(hashes, units):
+        if h not in cache and h not in misses:
+            misses[h] = unit
+
+    miss_hashes = list(misses)
+    chunks = _pack([misses[h] for h in miss_hashes], budget)
+    results = await asyncio.gather(
+        *[
+            _translate_chunk([misses[miss_hashes[j]] for j in chunk], source_lang)
+            for chunk in chunks
+        ],
+        return_exceptions=True,
+    )
+    # A failed chunk leaves only its own units untranslated (confidence 0);
+    # the other chunks' translations are kept and cached
+    fresh: dict[str, tuple[str, float]] = {}
+    failed: dict[str, tuple[str, float]] = {}
+    chunk_meta = []
+    for chunk, result in zip(chunks, results):
+        entry = {"units": len(chunk), "chars": sum(len(misses[miss_hashes[j]]) for j in chunk)}
+        if isinstance(result, Exception):
+            logger.error("Translation chunk failed for %s text: %s", source_lang, result)
+            for j in chunk:
+                failed[miss_hashes[j]] = (misses[miss_hashes[j]], 0.0)
+            entry.update(confidence=0.0, error=str(result)[:200])
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            translations, confidence = result
+            for j, translated in zip(chunk, translations):
+                fresh[miss_hashes[j]] = (translated, confidence)
+            entry["confidence"] = confidence
+        chunk_meta.append(entry)
+    try:
+        await _store(source_lang, model, fresh)
+    except Exception as exc:
+        logger.warning("Could not cache %d translations: %s", len(fresh), exc)
+    cache.update(fresh)
+    cache.update(failed)
+
+    out = list(parts)
+    translated_parts: dict[int, list[str]] = {}
+    weighted = 0.0
+    for h, (i, unit) in zip(hashes, units):
+        translated, confidence = cache[h]
+        translated_parts.setdefault(i, []).append(translated)
+        weighted += confidence * len(unit)
+    for i, pieces in translated_parts.items():
+        out[i] = " ".join(pieces)
+
+    total_chars = sum(len(u) for _, u in units)
+    confidence = round(weighted / total_chars, 3) if total_chars else 1.0
+    meta = {
+        "units": len(units),
+        "cached_units": sum(1 for h in hashes if h not in fresh and h not in failed),
+        "chunks": chunk_meta,
+        "failed_units": sum(1 for h in hashes if h in failed),
+        "truncated": truncated,
+        "model": model,
+    }
+    if units:
+        logger.debug("Translation: %d units, %d cached, %d chunks",
+                     len(units), meta["cached_units"], len(chunks))
+    return Translation("".join(out).strip(), confidence, meta)
+
+
+async def translate_to_english(text: str, source_lang: str) -> tuple[str, float]:
+    """Translate text to English using LLM. Returns (translated_text, confidence).
+    If text is already English, returns it unchanged."""
+    result = await translate_document(text, source_lang)
+    return result.text, result.confidence
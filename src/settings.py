@@ -52,7 +52,70 @@ class Settings(BaseSettings):
     brave_api_key: str = ""
     serper_api_key: str = ""
     llm_concurrency: int = 5
+    translate_chunk_tokens: int = 1500
+    translate_max_chars: int = 200_000
+    extract_chunk_chars: int = 12_000
+    extract_max_chars: int = 200_000  # keep >= translate_max_chars: extraction reads all of text_en
+    translate_cache_min_confidence: float = 0.5
+    relevance_prefilter_enabled: bool = True
+    relevance_min_score: int = 2
+    relevance_exempt_tiers: list[int] = [1]
+    relevance_sample_chars: int = 8000
+    lang_detect_sample_chars: int = 2000
+    lang_detect_prior_min_share: float = 0.6
+    lang_detect_min_kana_share: float = 0.1
+    lang_detect_low_accuracy: bool = False
+    lang_detect_preload: bool = False
     http_rate_limit_per_domain: float = 1.0
+    http_max_connections: int = 100
+    http_max_connections_per_host: int = 4
+    http_keepalive_expiry: float = 30.0
+    collect_fetch_concurrency: int = 6
+    collect_sweep_deadline_seconds: float = 180.0
+    collect_global_concurrency: int = 8
+    collect_rss_reserved_slots: int = 2  # global slots only RSS may use
+    parse_workers: int = 2
+    parse_single_pass: bool = True
+    pdf_max_bytes: int = 60_000_000
+    pdf_max_pages: int = 200
+    pdf_max_chars: int = 200_000
+    pdf_pages_per_task: int = 16
+    render_contexts: int = 2
+    render_wait_until: str = "networkidle"  # SPAs fill in over XHR; "domcontentloaded" / "load" are opt-in
+    render_timeout_seconds: float = 30.0
+    render_block_resources: list[str] = ["image", "media", "font"]
+    url_filter_enabled: bool = True
+    url_filter_capacity: int = 2_000_000
+    url_filter_error_rate: float = 0.0001
+    near_dup_min_chars: int = 500
+    near_dup_max_distance: int = 3
+    near_dup_window_days: int = 30
+    serper_cache_ttl_hours: float = 12.0
+    schedule_min_minutes: int = 10
+    schedule_max_minutes: int = 720
+    schedule_idle_growth: float = 1.25
+    schedule_jitter_fraction: float = 0.1
+    query_bandit_exploration: float = 0.5
+    link_min_score: float = 0.1
+    rss_full_content_min_chars: int = 1500
+    hybrid_min_chars: int = 500
+    fetch_max_bytes: int = 5_000_000
+    hybrid_reprobe_hours: float = 24.0
+    sitemap_max_bytes: int = 20_000_000
+    sitemap_max_children: int = 5
+    sitemap_max_urls: int = 30
+    archive_enabled: bool = True
+    archive_dir: str = "data/archive"
+    archive_zstd_level: int = 10
+    collect_method_concurrency: dict[str, int] = {
+        "rss": 6,
+        "scrape_html": 3,
+        "scrape_js": 2,
+        "scrape_hybrid": 3,
+        "pdf_monitor": 2,
+        "web_search": 3,
+        "sitemap": 4,
+    }
     max_alerts_per_day: int = 20
 
     def load_llm_config(self) -> dict:
@@ -61,6 +124,10 @@ class Settings(BaseSettings):
     def load_seed_sources(self) -> list[dict]:
         return load_seed_sources()
 
+    def seed_source(self, source_id: str) -> dict:
+        """The seed_sources.yml entry for a source ({} if not seeded), for per-source options."""
+        return next((s for s in load_seed_sources() if s.get("source_id") == source_id), {})
+
     def load_seed_entities(self) -> list[dict]:
         return load_seed_entities()
 